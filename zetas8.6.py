@@ -10,16 +10,32 @@ import sys
 import os
 import subprocess
 import shutil
+import stat
 import json
+import hashlib
 import time
-import platform
+import atexit
 import glob
+import fnmatch
+import functools
 from pathlib import Path
-from datetime import datetime
+from types import MappingProxyType
+from collections import deque
+from itertools import islice
 from typing import Dict, List, Optional, Tuple, Any, Union
 import importlib
+import importlib.util
 
 # ==================== 工具函数 ====================
+# 启动时确定一次的路径与平台信息
+HOME_DIR = Path.home()
+IS_WINDOWS = os.name == 'nt'
+IS_MACOS = sys.platform == 'darwin'
+# os.fwalk 只在支持 dir_fd 的平台（POSIX）上提供
+HAS_FWALK = hasattr(os, 'fwalk')
+# 子进程输出的编码：Windows 中文系统使用 GBK，Linux/macOS 使用 UTF-8
+SYSTEM_ENCODING = 'gbk' if IS_WINDOWS else 'utf-8'
+
 # 检测是否作为 EXE 运行
 def is_running_as_exe():
     """检测当前是否作为打包的 EXE 文件运行"""
@@ -32,6 +48,15 @@ def install_dependencies():
     if is_running_as_exe():
         return True
         
+    # 上次完整检查通过后会写入标记文件，同一Python版本下直接跳过探测
+    sentinel = HOME_DIR / ".zetas_deps_ok"
+    python_version = str(sys.version_info[:2])
+    try:
+        if sentinel.read_text(encoding='utf-8').strip() == python_version:
+            return True
+    except OSError:
+        pass
+    
     required_packages = [
         'pywin32',
         'psutil', 
@@ -43,18 +68,28 @@ def install_dependencies():
     
     print("正在检查依赖库...")
     
+    missing = []
     for package in required_packages:
-        try:
-            importlib.import_module(package.replace('-', '_'))
+        # find_spec 只查找模块，不执行模块的导入代码
+        if importlib.util.find_spec(package.replace('-', '_')) is not None:
             print(f"  {package} 已安装")
-        except ImportError:
-            print(f"  正在安装 {package}...")
-            try:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", package, "--quiet"])
-                print(f"  {package} 安装成功")
-            except Exception as e:
-                print(f"  {package} 安装失败: {e}")
-                return False
+        else:
+            missing.append(package)
+    
+    if missing:
+        # 所有缺失的包合并为一次 pip 调用
+        print(f"  正在安装 {' '.join(missing)}...")
+        try:
+            subprocess.check_call([sys.executable, "-m", "pip", "install", "--quiet", *missing])
+            print(f"  {' '.join(missing)} 安装成功")
+        except Exception as e:
+            print(f"  安装失败: {e}")
+            return False
+    
+    try:
+        sentinel.write_text(python_version, encoding='utf-8')
+    except OSError:
+        pass
     return True
 
 # 安装依赖（如果不是 EXE 运行）
@@ -63,16 +98,38 @@ if not install_dependencies():
     print("pip install pywin32 psutil requests colorama tqdm pycryptodome")
     sys.exit(1)
 
+# 延迟导入的模块代理，首次访问属性时才真正导入
+class _LazyModule:
+    """延迟导入模块"""
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
+
 # 现在可以安全导入其他模块
-import requests
-import psutil
-import webbrowser
+# psutil / requests / webbrowser 启动时用不到，改为按需导入
+requests = _LazyModule('requests')
+psutil = _LazyModule('psutil')
+webbrowser = _LazyModule('webbrowser')
+# platform 只在显示系统信息时使用
+platform = _LazyModule('platform')
 import re
 import base64
+import binascii
 import io
+import codecs
+import select
+import socket
+import getpass
 import textwrap
+# Colors 的常量在类定义时就要用到 colorama，必须立即导入
 from colorama import Fore, Style, init, Back
-from tqdm import tqdm
 
 # 尝试导入readline用于命令补全
 try:
@@ -81,9 +138,69 @@ try:
 except ImportError:
     READLINE_AVAILABLE = False
 
+# 尝试导入orjson用于更快的JSON序列化
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _json_loads(payload: bytes) -> Any:
+    """解析JSON，优先使用orjson"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload.decode('utf-8'))
+
+def _json_dumps(data: Any) -> bytes:
+    """序列化为缩进格式的JSON字节串，优先使用orjson"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+# 历史记录文件，readline 可用时由 readline 负责读写
+HISTORY_FILE = HOME_DIR / ".zetas_history"
+HISTORY_LENGTH = 2000
+# 控制台内存中保留的命令历史条数
+COMMAND_HISTORY_SIZE = 100
+
+def _write_readline_history():
+    """退出时保存readline历史记录"""
+    try:
+        readline.write_history_file(str(HISTORY_FILE))
+    except Exception:
+        pass
+
 # 初始化colorama
 init(autoreset=True)
 
+# 终端上的标准输出按行缓冲，遇到换行会自动刷新
+STDOUT_IS_TTY = sys.stdout.isatty()
+
+class _AnsiStrippingStream:
+    """输出到管道或文件时去掉ANSI颜色码，并保留底层流的块缓冲
+
+    colorama 的包装会在每次写入后立即刷新，批量输出时每行都是一次系统调用
+    """
+    
+    _ANSI_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+    
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def write(self, text):
+        if '\x1b' in text:
+            text = self._ANSI_RE.sub('', text)
+        return self._stream.write(text)
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+if not STDOUT_IS_TTY and sys.__stdout__ is not None:
+    # 即使以 -u 或 PYTHONUNBUFFERED 运行也使用块缓冲，退出时统一刷新
+    sys.__stdout__.reconfigure(line_buffering=False, write_through=False)
+    sys.stdout = _AnsiStrippingStream(sys.__stdout__)
+    atexit.register(sys.stdout.flush)
+
 # ==================== PowerShell蓝色主题颜色 ====================
 class Colors:
     """PowerShell 蓝色主题颜色"""
@@ -127,6 +244,27 @@ class Colors:
         'bg_white': Back.WHITE,
     }
 
+# Windows颜色代码 -> 颜色名称
+_WIN_COLOR_NAMES = {
+    '0': 'black', '1': 'blue', '2': 'green', '3': 'cyan',
+    '4': 'red', '5': 'magenta', '6': 'yellow', '7': 'white',
+    '8': 'lightblack', '9': 'lightblue', 'A': 'lightgreen',
+    'B': 'lightcyan', 'C': 'lightred', 'D': 'lightmagenta',
+    'E': 'lightyellow', 'F': 'lightwhite'
+}
+
+def _color_prefix(background: str, foreground: str) -> str:
+    """背景色+前景色对应的转义序列"""
+    return (Colors.COLOR_MAP.get(f'bg_{background}', Back.BLACK)
+            + Colors.COLOR_MAP.get(foreground, Fore.WHITE))
+
+# 两位颜色代码 -> (背景名, 前景名, 转义序列)，导入时一次性生成
+_WIN_COLOR_TABLE = {
+    bg_code + fg_code: (bg_name, fg_name, _color_prefix(bg_name, fg_name))
+    for bg_code, bg_name in _WIN_COLOR_NAMES.items()
+    for fg_code, fg_name in _WIN_COLOR_NAMES.items()
+}
+
 # ==================== 颜色管理器 ====================
 class ColorManager:
     """颜色管理器"""
@@ -140,83 +278,77 @@ class ColorManager:
         """设置全局颜色（类似于cmd的color命令）"""
         # 支持两种格式：color 0A 或 color 0A
         if len(color_code) == 2:
-            try:
-                # 解析Windows颜色代码
-                bg_code = color_code[0].upper()
-                fg_code = color_code[1].upper()
-                
-                color_map = {
-                    '0': 'black', '1': 'blue', '2': 'green', '3': 'cyan',
-                    '4': 'red', '5': 'magenta', '6': 'yellow', '7': 'white',
-                    '8': 'lightblack', '9': 'lightblue', 'A': 'lightgreen',
-                    'B': 'lightcyan', 'C': 'lightred', 'D': 'lightmagenta',
-                    'E': 'lightyellow', 'F': 'lightwhite'
-                }
-                
-                if bg_code in color_map and fg_code in color_map:
-                    self.current_background = color_map[bg_code]
-                    self.current_foreground = color_map[fg_code]
-                    self.update_global_color()
-                    print(f"{Colors.SUCCESS}颜色已设置为: 背景={self.current_background}, 前景={self.current_foreground}{Colors.RESET}")
-                    return True
-            except Exception as e:
-                print(f"{Colors.ERROR}颜色代码无效: {e}{Colors.RESET}")
-                return False
+            entry = _WIN_COLOR_TABLE.get(color_code.upper())
+            if entry is not None:
+                self.current_background, self.current_foreground, prefix = entry
+                sys.stdout.write(prefix)
+                print(f"{Colors.SUCCESS}颜色已设置为: 背景={self.current_background}, 前景={self.current_foreground}{Colors.RESET}")
+                return True
+            return False
         else:
             print(f"{Colors.ERROR}用法: color <背景><前景> (例如: color 0A){Colors.RESET}")
             return False
     
     def update_global_color(self):
         """更新全局颜色显示"""
-        bg_color = Colors.COLOR_MAP.get(f'bg_{self.current_background}', Back.BLACK)
-        fg_color = Colors.COLOR_MAP.get(self.current_foreground, Fore.WHITE)
-        sys.stdout.write(bg_color + fg_color)
-        sys.stdout.flush()
+        sys.stdout.write(_color_prefix(self.current_background, self.current_foreground))
     
     def reset_color(self):
         """重置颜色"""
         self.current_foreground = 'white'
         self.current_background = 'black'
         sys.stdout.write(Colors.RESET)
-        sys.stdout.flush()
         print(f"{Colors.SUCCESS}颜色已重置{Colors.RESET}")
 
 # ==================== 增强的伪Python环境 ====================
+# 彩色输出标记，一次替换文本中的所有标记
+_COLOR_MARK_RE = re.compile(r'\$(?:bg_([a-z]+):)?([a-z_]+):([^$]*)\$')
+# (背景色, 前景色) -> 转义序列，未知颜色记为 None
+_COLOR_MARK_PREFIXES: Dict[Tuple[Optional[str], str], Optional[str]] = {}
+
+def _color_mark_repl(match) -> str:
+    """把单个颜色标记替换为带转义序列的文本"""
+    key = (match.group(1), match.group(2))
+    try:
+        prefix = _COLOR_MARK_PREFIXES[key]
+    except KeyError:
+        bg_code, fg_code = key
+        fg_color = Colors.COLOR_MAP.get(fg_code)
+        bg_color = Colors.COLOR_MAP.get(f'bg_{bg_code}') if bg_code else ''
+        prefix = bg_color + fg_color if fg_color and bg_color is not None else None
+        _COLOR_MARK_PREFIXES[key] = prefix
+    
+    if prefix is None:
+        # 未知颜色保持原样输出
+        return match.group(0)
+    return prefix + match.group(3) + Colors.RESET
+
 class EnhancedPythonEnvironment:
     """增强的伪Python环境"""
     
     def __init__(self):
-        self.local_vars = {}
         self.available_modules = {
             'math', 'random', 'datetime', 'time', 'os', 'sys',
             'json', 're', 'collections', 'itertools', 'functools',
             'string', 'hashlib', 'base64', 'urllib', 'pathlib'
         }
-        self.imported_modules = {}
+        # 持久的执行环境，变量和导入的模块直接保存在其中
+        self.exec_globals = self._new_globals()
+    
+    def _new_globals(self) -> Dict[str, Any]:
+        """创建一个安全的执行环境"""
+        return {
+            '__builtins__': __builtins__,
+            '__name__': '__main__',
+            '__doc__': None,
+            '__package__': None,
+            'print': self._custom_print
+        }
     
     def execute_code(self, code: str) -> Tuple[bool, Any]:
         """执行Python代码"""
         try:
-            # 创建一个安全的执行环境
-            exec_globals = {
-                '__builtins__': __builtins__,
-                '__name__': '__main__',
-                '__doc__': None,
-                '__package__': None,
-                'print': self._custom_print
-            }
-            
-            # 更新全局变量
-            exec_globals.update(self.imported_modules)
-            exec_globals.update(self.local_vars)
-            
-            # 执行代码
-            exec(code, exec_globals, self.local_vars)
-            
-            # 更新局部变量
-            self.local_vars.update({k: v for k, v in exec_globals.items() 
-                                   if not k.startswith('__')})
-            
+            exec(code, self.exec_globals)
             return True, None
             
         except Exception as e:
@@ -230,17 +362,17 @@ class EnhancedPythonEnvironment:
             try:
                 code = input(f"{Colors.PROMPT}py>{Colors.RESET} ").strip()
                 
-                if code.lower() == 'exit':
+                code_lower = code.lower()
+                if code_lower == 'exit':
                     break
-                elif code.lower() == 'help':
+                elif code_lower == 'help':
                     self._show_help()
                     continue
-                elif code.lower() == 'clear':
-                    self.local_vars.clear()
-                    self.imported_modules.clear()
+                elif code_lower == 'clear':
+                    self.exec_globals = self._new_globals()
                     print(f"{Colors.SUCCESS}环境已清空{Colors.RESET}")
                     continue
-                elif code.lower().startswith('import '):
+                elif code_lower.startswith('import '):
                     self._import_module(code)
                     continue
                 
@@ -258,29 +390,16 @@ class EnhancedPythonEnvironment:
         sep = kwargs.get('sep', ' ')
         end = kwargs.get('end', '\n')
         
-        # 检查是否有颜色标记
-        text = sep.join(str(arg) for arg in args)
-        if text.startswith('$'):
-            # 解析颜色标记: $color:text$ 或 $color:bg:color:text$
-            parts = text[1:].split('$', 1)
-            if len(parts) == 2:
-                color_spec, content = parts
-                color_parts = color_spec.split(':')
-                
-                if len(color_parts) == 1:
-                    # 只有前景色
-                    color_code = color_parts[0]
-                    color = Colors.COLOR_MAP.get(color_code, Colors.RESET)
-                    text = color + content + Colors.RESET
-                elif len(color_parts) == 2:
-                    # 背景色和前景色
-                    bg_code, fg_code = color_parts
-                    bg_color = Colors.COLOR_MAP.get(f'bg_{bg_code}', Colors.RESET)
-                    fg_color = Colors.COLOR_MAP.get(fg_code, Colors.RESET)
-                    text = bg_color + fg_color + content + Colors.RESET
-        
-        sys.stdout.write(text + end)
-        sys.stdout.flush()
+        # 检查是否有颜色标记: $color:text$ 或 $bg_color:color:text$
+        text = sep.join(map(str, args))
+        if '$' in text:
+            text = _COLOR_MARK_RE.sub(_color_mark_repl, text)
+        
+        sys.stdout.write(text)
+        sys.stdout.write(end)
+        # 终端上不以换行结尾的输出需要立即显示
+        if STDOUT_IS_TTY and not end.endswith('\n'):
+            sys.stdout.flush()
     
     def _show_help(self):
         """显示帮助"""
@@ -313,8 +432,7 @@ class EnhancedPythonEnvironment:
         
         if module_name in self.available_modules:
             try:
-                module = __import__(module_name)
-                self.imported_modules[module_name] = module
+                self.exec_globals[module_name] = __import__(module_name)
                 print(f"{Colors.SUCCESS}模块 '{module_name}' 导入成功{Colors.RESET}")
             except Exception as e:
                 print(f"{Colors.ERROR}导入模块失败: {e}{Colors.RESET}")
@@ -333,6 +451,42 @@ class ResourceMonitor:
             'temp': 75.0
         }
         self.warnings_enabled = True
+        # 分区列表很少变化，缓存一段时间
+        self.partitions_ttl = 30
+        self._partitions = None
+        self._partitions_time = 0.0
+        # CPU使用率的指数滑动平均，代替阻塞式的采样间隔
+        self._cpu_average = None
+        self._cpu_primed = False
+        # 系统信息/监控显示用的 (CPU使用率, 内存信息) 缓存
+        self.sample_interval = 2.0
+        self._sample = None
+        self._sample_time = 0.0
+    
+    def _cpu_sample(self) -> float:
+        """非阻塞地获取CPU使用率"""
+        if not self._cpu_primed:
+            # 首次非阻塞调用没有基准，返回值无意义，用一次短采样代替
+            self._cpu_primed = True
+            return psutil.cpu_percent(interval=0.1)
+        # 之后的非阻塞调用返回与上次调用之间的使用率
+        return psutil.cpu_percent(interval=None)
+    
+    def sample_usage(self):
+        """获取 (CPU使用率, 内存信息)，短时间内重复调用返回缓存结果"""
+        now = time.monotonic()
+        if self._sample is None or now - self._sample_time >= self.sample_interval:
+            self._sample = (self._cpu_sample(), psutil.virtual_memory())
+            self._sample_time = now
+        return self._sample
+    
+    def _get_partitions(self):
+        """获取磁盘分区列表（带缓存）"""
+        now = time.monotonic()
+        if self._partitions is None or now - self._partitions_time > self.partitions_ttl:
+            self._partitions = psutil.disk_partitions(all=False)
+            self._partitions_time = now
+        return self._partitions
     
     def check_resources(self):
         """检查系统资源"""
@@ -340,7 +494,12 @@ class ResourceMonitor:
         
         try:
             # CPU使用率
-            cpu_percent = psutil.cpu_percent(interval=0.5)
+            sample = self._cpu_sample()
+            if self._cpu_average is None:
+                self._cpu_average = sample
+            else:
+                self._cpu_average = 0.7 * self._cpu_average + 0.3 * sample
+            cpu_percent = self._cpu_average
             if cpu_percent > self.warning_thresholds['cpu']:
                 warnings.append(f"CPU使用率过高: {cpu_percent:.1f}%")
             
@@ -350,7 +509,7 @@ class ResourceMonitor:
                 warnings.append(f"内存使用率过高: {mem.percent:.1f}%")
             
             # 磁盘使用率
-            for partition in psutil.disk_partitions():
+            for partition in self._get_partitions():
                 try:
                     usage = psutil.disk_usage(partition.mountpoint)
                     if usage.percent > self.warning_thresholds['disk']:
@@ -364,24 +523,38 @@ class ResourceMonitor:
         return warnings
 
 # ==================== 进度管理器 ====================
+class _ProgressReader:
+    """读取时同步更新进度条的文件包装"""
+    
+    def __init__(self, fileobj, pbar):
+        self._fileobj = fileobj
+        self._pbar = pbar
+    
+    def read(self, size=-1):
+        buf = self._fileobj.read(size)
+        self._pbar.update(len(buf))
+        return buf
+
 class ProgressManager:
     """进度管理器"""
     
+    COPY_BUFFER_SIZE = 4 * 1024 * 1024
+    
     @staticmethod
     def copy_with_progress(src: str, dst: str):
         """带进度显示的文件复制"""
         try:
+            # 非交互终端不需要进度条，直接走系统的快速复制路径
+            if not STDOUT_IS_TTY:
+                shutil.copyfile(src, dst)
+                return True
+            
+            from tqdm import tqdm
             total_size = os.path.getsize(src)
             
             with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst, \
                  tqdm(total=total_size, unit='B', unit_scale=True, desc=f"复制 {os.path.basename(src)}") as pbar:
-                
-                while True:
-                    buf = fsrc.read(1024 * 1024)
-                    if not buf:
-                        break
-                    fdst.write(buf)
-                    pbar.update(len(buf))
+                shutil.copyfileobj(_ProgressReader(fsrc, pbar), fdst, ProgressManager.COPY_BUFFER_SIZE)
             
             return True
         except Exception as e:
@@ -393,24 +566,37 @@ class AliasManager:
     """命令别名管理器"""
     
     def __init__(self):
-        self.aliases_file = Path.home() / ".zetas_aliases"
+        self.aliases_file = HOME_DIR / ".zetas_aliases"
         self.aliases = {}
+        # 命令名（第一个词） -> 别名对应的命令，不是别名时为None；别名变化时清空
+        self._expand_cache: Dict[str, Optional[str]] = {}
+        # 别名文件的修改时间，其他会话修改文件后自动重新加载
+        self._mtime = None
         self._load_aliases()
     
+    def _file_mtime(self):
+        """别名文件的修改时间，文件不存在时为None"""
+        st = _safe_stat(str(self.aliases_file))
+        return st.st_mtime_ns if st is not None else None
+    
     def _load_aliases(self):
         """加载别名配置"""
-        if self.aliases_file.exists():
+        self._expand_cache.clear()
+        self._mtime = self._file_mtime()
+        if self._mtime is not None:
             try:
-                with open(self.aliases_file, 'r', encoding='utf-8') as f:
-                    self.aliases = json.load(f)
+                self.aliases = _json_loads(self.aliases_file.read_bytes())
             except Exception:
                 self.aliases = {}
+        else:
+            self.aliases = {}
     
     def _save_aliases(self):
         """保存别名配置"""
+        self._expand_cache.clear()
         try:
-            with open(self.aliases_file, 'w', encoding='utf-8') as f:
-                json.dump(self.aliases, f, indent=2, ensure_ascii=False)
+            self.aliases_file.write_bytes(_json_dumps(self.aliases))
+            self._mtime = self._file_mtime()
         except Exception as e:
             print(f"{Colors.WARNING}保存别名失败: {e}{Colors.RESET}")
     
@@ -448,27 +634,36 @@ class AliasManager:
     
     def expand_alias(self, command: str):
         """展开别名"""
-        parts = command.strip().split(maxsplit=1)
+        if self._file_mtime() != self._mtime:
+            self._load_aliases()
+        
+        if not self.aliases:
+            return command
+        
+        parts = command.split(maxsplit=1)
         if not parts:
             return command
         
-        cmd_name = parts[0]
-        if cmd_name in self.aliases:
-            alias_command = self.aliases[cmd_name]
-            if len(parts) > 1:
-                return f"{alias_command} {parts[1]}"
-            else:
-                return alias_command
+        # 只按命令名缓存，参数不同的命令行共用同一条记录
+        name = parts[0]
+        if name in self._expand_cache:
+            alias_command = self._expand_cache[name]
+        else:
+            alias_command = self._expand_cache[name] = self.aliases.get(name)
         
-        return command
+        if alias_command is None:
+            return command
+        if len(parts) > 1:
+            return f"{alias_command} {parts[1].strip()}"
+        return alias_command
 
 # ==================== 配置类 ====================
 class Config:
     """配置管理类"""
     def __init__(self):
-        self.config_path = Path.home() / ".zetas_config.json"
+        self.config_path = HOME_DIR / ".zetas_config.json"
         self.data = {
-            "template_dir": str(Path.home() / "Documents"),
+            "template_dir": str(HOME_DIR / "Documents"),
             "default_browser": "",
             "enable_confirmation": True,
             "process_list_page_size": 20,
@@ -479,19 +674,27 @@ class Config:
             "interface_mode": "console",
             "enable_bash_syntax": True,
             "parameter_priority": True,
-            "global_color": "07"
+            "global_color": "07",
+            "enable_async_multi": False
         }
+        # 保存一份默认值，重新加载时先恢复默认值再读取文件
+        self._defaults = dict(self.data)
+        # 修改只标记为脏，退出时统一写入；记录上次写入内容的摘要以跳过相同写入
+        self._dirty = False
+        self._last_hash = None
+        self._view = MappingProxyType(self.data)
         self.load()
+        atexit.register(self._flush)
     
     def load(self):
         """加载配置并验证"""
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    loaded_data = json.load(f)
+                loaded_data = _json_loads(self.config_path.read_bytes())
                     
                 validated_data = self._validate_config(loaded_data)
                 self.data.update(validated_data)
+                self._last_hash = self._payload_hash(self._serialize())
                 
             except json.JSONDecodeError:
                 print(f"{Colors.WARNING}配置文件已损坏，使用默认配置{Colors.RESET}")
@@ -528,22 +731,59 @@ class Config:
         except Exception as e:
             print(f"{Colors.ERROR}创建默认配置文件失败: {e}{Colors.RESET}")
     
+    def _serialize(self) -> bytes:
+        """序列化配置数据"""
+        return _json_dumps(self.data)
+    
+    @staticmethod
+    def _payload_hash(payload: bytes) -> bytes:
+        """计算配置内容摘要"""
+        return hashlib.blake2b(payload, digest_size=8).digest()
+    
     def save(self):
         """保存配置"""
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            payload = self._serialize()
+            payload_hash = self._payload_hash(payload)
+            if payload_hash == self._last_hash and self.config_path.exists():
+                self._dirty = False
+                return
+            
+            # 先写临时文件再替换，避免写入中断导致配置文件损坏
+            tmp_path = self.config_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.config_path)
+            self._last_hash = payload_hash
+            self._dirty = False
         except Exception as e:
             print(f"{Colors.ERROR}保存配置失败: {e}{Style.RESET_ALL}")
     
+    def _flush(self):
+        """退出时写入未保存的修改"""
+        if self._dirty:
+            self.save()
+    
     def get(self, key, default=None):
         """获取配置项"""
         return self.data.get(key, default)
     
+    def snapshot(self):
+        """获取只读的配置视图（不复制数据）"""
+        return self._view
+    
+    def reload(self):
+        """重新从磁盘加载配置，丢弃未保存的修改"""
+        # 原地恢复默认值，保持 snapshot() 返回的视图有效
+        self.data.clear()
+        self.data.update(self._defaults)
+        self._dirty = False
+        self.load()
+    
     def set(self, key, value):
         """设置配置项"""
         self.data[key] = value
-        self.save()
+        self._dirty = True
 
 # 全局配置实例
 config = Config()
@@ -562,6 +802,9 @@ class ScriptState:
 script_state = ScriptState()
 
 # ==================== 多命令处理器 ====================
+# 多命令解析时需要特殊处理的字符：转义符、引号和分隔符
+_COMMAND_SPECIAL_RE = re.compile(r'[\\\'"+]')
+
 class MultiCommandProcessor:
     """多命令处理器（支持+分隔）"""
     
@@ -571,42 +814,53 @@ class MultiCommandProcessor:
     def parse_commands(self, command_string: str) -> List[str]:
         """解析使用+分隔的命令"""
         commands = []
-        current_command = []
+        pieces = []
         in_quotes = False
         quote_char = None
-        skip_next = False
+        pos = 0
+        length = len(command_string)
         
-        for i, char in enumerate(command_string):
-            if skip_next:
-                skip_next = False
-                current_command.append(char)
-                continue
+        # 只在特殊字符处停下，普通字符按整段切片
+        while True:
+            match = _COMMAND_SPECIAL_RE.search(command_string, pos)
+            if match is None:
+                pieces.append(command_string[pos:])
+                break
             
-            if char == '\\' and i + 1 < len(command_string):
-                # 转义字符
-                current_command.append(command_string[i + 1])
-                skip_next = True
-                continue
+            i = match.start()
+            char = command_string[i]
+            pieces.append(command_string[pos:i])
+            pos = i + 1
             
-            if char in ('"', "'"):
+            if char == '\\':
+                if i + 1 < length:
+                    # 转义字符
+                    pieces.append(command_string[i + 1])
+                    pos = i + 2
+                else:
+                    pieces.append(char)
+            elif char == '+':
+                if in_quotes:
+                    pieces.append(char)
+                else:
+                    # 分隔命令
+                    current_command = ''.join(pieces)
+                    if current_command:
+                        commands.append(current_command.strip())
+                    pieces = []
+            else:
                 if not in_quotes:
                     in_quotes = True
                     quote_char = char
                 elif quote_char == char:
                     in_quotes = False
                     quote_char = None
-                current_command.append(char)
-            elif char == '+' and not in_quotes:
-                # 分隔命令
-                if current_command:
-                    commands.append(''.join(current_command).strip())
-                    current_command = []
-            else:
-                current_command.append(char)
+                pieces.append(char)
         
         # 添加最后一个命令
+        current_command = ''.join(pieces)
         if current_command:
-            commands.append(''.join(current_command).strip())
+            commands.append(current_command.strip())
         
         return commands
     
@@ -614,9 +868,39 @@ class MultiCommandProcessor:
         """执行多个命令"""
         commands = self.parse_commands(command_string)
         
-        if len(commands) > 1:
-            print(f"{Colors.INFO}检测到 {len(commands)} 个命令，将依次执行:{Colors.RESET}")
+        concurrent = (len(commands) > 1
+                      and str(config.get('enable_async_multi')).lower() in ('true', '1', 'yes', 'on'))
+        if concurrent:
+            # 别名只展开一次，判断和执行都使用展开后的命令
+            console = self.console
+            pairs = [(cmd, console.alias_manager.expand_alias(cmd).strip()) for cmd in commands if cmd]
+            # 可执行文件（如 .py 脚本）在依次执行时由 _run_executable 处理，这类命令不并发
+            concurrent = all(console._is_external_command(expanded)
+                             and not console._is_executable_in_path(expanded)
+                             for _, expanded in pairs)
+        
+        if concurrent:
+            # 全部是系统命令时并发执行，按顺序输出结果
+            print(f"{Colors.INFO}检测到 {len(commands)} 个命令，将并发执行:{Colors.RESET}")
+            results = self._execute_concurrently(pairs)
+            # 系统命令可能改动了文件，find 的遍历缓存不再可靠
+            console._find_cache.clear()
+        else:
+            if len(commands) > 1:
+                print(f"{Colors.INFO}检测到 {len(commands)} 个命令，将依次执行:{Colors.RESET}")
+            results = self._execute_sequentially(commands)
         
+        # 显示汇总结果
+        if len(results) > 1:
+            print(f"{Colors.HEADER}执行汇总:{Colors.RESET}")
+            success_count = sum(1 for _, success, _ in results if success)
+            print(f"  成功: {success_count}/{len(results)} 个命令")
+            for cmd, success, exec_time in results:
+                status = f"{Colors.SUCCESS}✓" if success else f"{Colors.ERROR}✗"
+                print(f"  {status} {cmd} ({exec_time:.2f}s){Colors.RESET}")
+    
+    def _execute_sequentially(self, commands: List[str]) -> List[Tuple[str, bool, float]]:
+        """依次执行命令"""
         results = []
         for i, cmd in enumerate(commands, 1):
             if cmd:  # 跳过空命令
@@ -631,22 +915,78 @@ class MultiCommandProcessor:
                 except Exception as e:
                     print(f"{Colors.ERROR}执行失败: {e}{Colors.RESET}")
                     results.append((cmd, False, time.time() - start_time))
+        return results
+    
+    def _execute_concurrently(self, commands: List[Tuple[str, str]]) -> List[Tuple[str, bool, float]]:
+        """并发执行多个系统命令，commands 为 (原命令, 展开别名后的命令) 列表"""
+        import asyncio
         
-        # 显示汇总结果
-        if len(results) > 1:
-            print(f"{Colors.HEADER}执行汇总:{Colors.RESET}")
-            success_count = sum(1 for _, success, _ in results if success)
-            print(f"  成功: {success_count}/{len(results)} 个命令")
-            for cmd, success, exec_time in results:
-                status = f"{Colors.SUCCESS}✓" if success else f"{Colors.ERROR}✗"
-                print(f"  {status} {cmd} ({exec_time:.2f}s){Colors.RESET}")
+        encoding = SYSTEM_ENCODING
+        
+        async def run_one(cmd: str):
+            start_time = time.time()
+            args, use_shell = _split_command(cmd)
+            if use_shell:
+                proc = await asyncio.create_subprocess_shell(
+                    cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            else:
+                proc = await asyncio.create_subprocess_exec(
+                    *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            stdout, stderr = await proc.communicate()
+            return proc.returncode, stdout, stderr, time.time() - start_time
+        
+        async def run_all():
+            return await asyncio.gather(*(run_one(expanded) for _, expanded in commands),
+                                        return_exceptions=True)
+        
+        results = []
+        for i, ((cmd, expanded), outcome) in enumerate(zip(commands, asyncio.run(run_all())), 1):
+            print(f"{Colors.HEADER}[{i}/{len(commands)}] 执行: {cmd}{Colors.RESET}")
+            if expanded != cmd:
+                print(f"{Colors.INFO}执行别名: {cmd} -> {expanded}{Colors.RESET}")
+            if isinstance(outcome, Exception):
+                print(f"{Colors.ERROR}执行失败: {outcome}{Colors.RESET}")
+                results.append((cmd, False, 0.0))
+                continue
+            
+            returncode, stdout, stderr, exec_time = outcome
+            if stdout:
+                print(stdout.decode(encoding, errors='replace'))
+            if stderr:
+                print(f"{Colors.ERROR}{stderr.decode(encoding, errors='replace')}{Colors.RESET}")
+            results.append((cmd, returncode == 0, exec_time))
+        return results
 
 # ==================== 文件打开器 ====================
 class FileOpener:
     """文件打开器"""
     
-    @staticmethod
-    def open_file(file_path: str, program_path: str = None) -> bool:
+    # 已启动但尚未回收的默认打开程序进程
+    _spawned_pids: List[int] = []
+    
+    @classmethod
+    def _reap_spawned(cls):
+        """回收已退出的打开程序进程，避免产生僵尸进程"""
+        for pid in cls._spawned_pids[:]:
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done:
+                cls._spawned_pids.remove(pid)
+    
+    @classmethod
+    def _spawn_detached(cls, argv: List[str]):
+        """启动程序但不等待其结束"""
+        cls._reap_spawned()
+        sys.stdout.flush()
+        if hasattr(os, 'posix_spawnp'):
+            cls._spawned_pids.append(os.posix_spawnp(argv[0], argv, os.environ))
+        else:
+            subprocess.Popen(argv)
+    
+    @classmethod
+    def open_file(cls, file_path: str, program_path: str = None) -> bool:
         """打开文件"""
         try:
             file_path = os.path.abspath(file_path)
@@ -662,6 +1002,7 @@ class FileOpener:
                     return False
                 
                 print(f"{Colors.INFO}使用 {program_path} 打开 {file_path}{Colors.RESET}")
+                sys.stdout.flush()
                 try:
                     subprocess.run([program_path, file_path], check=False)
                     return True
@@ -672,16 +1013,13 @@ class FileOpener:
             # 如果没有指定程序，使用默认方式打开
             print(f"{Colors.INFO}使用默认程序打开: {file_path}{Colors.RESET}")
             
-            if os.name == 'nt':  # Windows
+            if IS_WINDOWS:
                 os.startfile(file_path)
-            elif os.name == 'posix':  # Linux/Mac
-                if sys.platform == 'darwin':  # macOS
-                    subprocess.run(['open', file_path], check=False)
-                else:  # Linux
-                    subprocess.run(['xdg-open', file_path], check=False)
-            else:
-                print(f"{Colors.WARNING}不支持的操作系统: {os.name}{Colors.RESET}")
-                return False
+            elif IS_MACOS:
+                # 打开文件的程序会自行转入后台，无需等待
+                cls._spawn_detached(['open', file_path])
+            else:  # Linux
+                cls._spawn_detached(['xdg-open', file_path])
             
             return True
             
@@ -689,14 +1027,97 @@ class FileOpener:
             print(f"{Colors.ERROR}打开文件失败: {e}{Colors.RESET}")
             return False
 
+# 视为可执行文件的扩展名
+EXECUTABLE_EXTENSIONS = frozenset({'.exe', '.bat', '.cmd', '.sh', '.py', '.app'})
+
+@functools.lru_cache(maxsize=256)
+def _which_cached(command: str) -> Optional[str]:
+    """缓存的PATH查找，重复输入同一命令时不再逐个目录探测"""
+    return shutil.which(command)
+
+# 脚本内容预览的最大字符数
+SCRIPT_PREVIEW_CHARS = 1000
+
+def _safe_stat(path: str) -> Optional[os.stat_result]:
+    """获取文件状态，路径不存在时返回None"""
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+# 出现这些字符时命令需要交给shell解释（管道、重定向、变量、通配符等）
+_SHELL_METACHARS = frozenset(';|&<>$`*?~%^' if IS_WINDOWS else ';|&<>$`*?~')
+
+def _split_command(command: str) -> Tuple[Union[str, List[str]], bool]:
+    """把命令行拆成argv，返回 (参数, 是否需要shell)"""
+    if not _SHELL_METACHARS.isdisjoint(command):
+        return command, True
+    
+    import shlex
+    try:
+        argv = shlex.split(command, posix=not IS_WINDOWS)
+    except ValueError:
+        return command, True
+    if not argv:
+        return command, True
+    
+    if IS_WINDOWS:
+        # 非POSIX模式会保留引号，这里去掉
+        argv = [arg[1:-1] if len(arg) >= 2 and arg[0] == arg[-1] == '"' else arg for arg in argv]
+    # dir、copy、type、export 等是shell的内置命令，找不到对应程序时仍交给shell执行
+    if _which_cached(argv[0]) is None:
+        return command, True
+    return argv, False
+
+def _run_command(command: str, **kwargs) -> subprocess.CompletedProcess:
+    """执行命令行，只在必要时启动shell"""
+    args, use_shell = _split_command(command)
+    return subprocess.run(args, shell=use_shell, **kwargs)
+
 # ==================== 参数优先级执行系统 ====================
 class ParameterSystem:
     """参数优先级执行系统"""
     
+    # 参数类别及其处理方法，按执行优先级排列
+    EXECUTION_SEQUENCE = (
+        ('commands', '_execute_command'),
+        ('scripts', '_execute_script'),
+        ('files', '_process_file'),
+        ('directories', '_process_directory'),
+        ('executables', '_execute_program'),
+    )
+    
     def __init__(self):
         self.execution_order = []
         self.enhanced_python = EnhancedPythonEnvironment()
         self.color_manager = ColorManager()
+        self.resource_monitor = ResourceMonitor()
+        self._help_text = self._render_help()
+        
+        # 命令分发表只构建一次
+        self._dispatch = {
+            'p': self._pseudo_python,
+            'monitor': self._zy_monitor,
+            'bash': self._bash_mode,
+            'help': self._show_help,
+            'config': self._config_command,
+            'sysinfo': self._sysinfo_command,
+            'fileops': self._file_operations,
+            'process': self._process_management,
+            'network': self._network_tools,
+            'encode': self._encoding_tools,
+            'time': self._time_tools,
+            'color': self._color_command
+        }
+        # 参数首字符 -> 解析方法
+        self._arg_handlers = {
+            '/': self._parse_command_arg,
+            '-': self._parse_option_arg,
+        }
+        self._execution_sequence = tuple(
+            (category, getattr(self, handler_name))
+            for category, handler_name in self.EXECUTION_SEQUENCE
+        )
         
     def parse_args(self, args: List[str]) -> Dict[str, Any]:
         """解析参数并排序"""
@@ -713,36 +1134,20 @@ class ParameterSystem:
         while i < len(args):
             arg = args[i]
             
-            if arg.startswith('/'):
-                cmd = arg[1:]
-                if i + 1 < len(args) and not args[i + 1].startswith(('-', '/')):
-                    result['commands'].append((cmd, args[i + 1]))
-                    i += 1
-                else:
-                    result['commands'].append((cmd, None))
-                    
-            elif arg.startswith('-'):
-                if i + 1 < len(args) and not args[i + 1].startswith(('-', '/')):
-                    result['options'][arg] = args[i + 1]
-                    i += 1
-                else:
-                    result['options'][arg] = True
-                    
+            # 按首字符分发 /命令 和 -选项，其余按路径分类
+            handler = self._arg_handlers.get(arg[:1])
+            if handler is not None:
+                i = handler(args, i, result)
+                
             elif arg.endswith('.zetas'):
                 result['scripts'].append(arg)
                 
-            elif os.path.isdir(arg):
-                result['directories'].append(arg)
-                
-            elif os.path.isfile(arg):
-                if self._is_executable(arg):
-                    result['executables'].append(arg)
-                else:
-                    result['files'].append(arg)
-                    
             else:
-                # 尝试判断是否为可执行文件
-                if self._is_executable(arg):
+                # 只stat一次，目录/文件/可执行判断都基于同一结果
+                st = _safe_stat(arg)
+                if st is not None and stat.S_ISDIR(st.st_mode):
+                    result['directories'].append(arg)
+                elif st is not None and self._is_executable(arg, st):
                     result['executables'].append(arg)
                 else:
                     result['files'].append(arg)
@@ -751,20 +1156,43 @@ class ParameterSystem:
         
         return result
     
-    def _is_executable(self, file_path: str) -> bool:
+    def _has_value_arg(self, args: List[str], i: int) -> bool:
+        """下一个参数是否为当前命令/选项的值"""
+        return i + 1 < len(args) and args[i + 1][:1] not in self._arg_handlers
+    
+    def _parse_command_arg(self, args: List[str], i: int, result: Dict[str, Any]) -> int:
+        """解析 /命令 [参数]，返回最后消耗的参数下标"""
+        cmd = args[i][1:]
+        if self._has_value_arg(args, i):
+            result['commands'].append((cmd, args[i + 1]))
+            return i + 1
+        result['commands'].append((cmd, None))
+        return i
+    
+    def _parse_option_arg(self, args: List[str], i: int, result: Dict[str, Any]) -> int:
+        """解析 -选项 [值]，返回最后消耗的参数下标"""
+        if self._has_value_arg(args, i):
+            result['options'][args[i]] = args[i + 1]
+            return i + 1
+        result['options'][args[i]] = True
+        return i
+    
+    def _is_executable(self, file_path: str, st: Optional[os.stat_result] = None) -> bool:
         """判断是否为可执行文件"""
-        if not os.path.exists(file_path):
-            return False
-        
-        ext = os.path.splitext(file_path)[1].lower()
-        executable_exts = {'.exe', '.bat', '.cmd', '.sh', '.py', '.app'}
+        if st is None:
+            st = _safe_stat(file_path)
+            if st is None:
+                return False
         
-        if ext in executable_exts:
-            return True
+        # 只取最后一个路径分隔符之后的扩展名
+        dot = file_path.rfind('.')
+        if dot > max(file_path.rfind('/'), file_path.rfind(os.sep)) + 1:
+            if file_path[dot:].lower() in EXECUTABLE_EXTENSIONS:
+                return True
         
         # 在Unix-like系统上检查执行权限
-        if os.name == 'posix':
-            return os.access(file_path, os.X_OK)
+        if not IS_WINDOWS:
+            return bool(st.st_mode & 0o111)
         
         return False
     
@@ -772,15 +1200,7 @@ class ParameterSystem:
         """按照优先级执行参数"""
         results: List[Tuple[str, bool]] = []
         
-        execution_sequence = [
-            ('commands', self._execute_command),
-            ('scripts', self._execute_script),
-            ('files', self._process_file),
-            ('directories', self._process_directory),
-            ('executables', self._execute_program),
-        ]
-        
-        for category, handler in execution_sequence:
+        for category, handler in self._execution_sequence:
             items = parsed_args.get(category, [])
             for item in items:
                 try:
@@ -806,23 +1226,9 @@ class ParameterSystem:
     
     def _execute_command(self, command: str, arg: Optional[str], script_state: ScriptState) -> bool:
         """执行内置命令"""
-        command_handlers = {
-            'p': self._pseudo_python,
-            'monitor': self._zy_monitor,
-            'bash': self._bash_mode,
-            'help': self._show_help,
-            'config': self._config_command,
-            'sysinfo': self._sysinfo_command,
-            'fileops': self._file_operations,
-            'process': self._process_management,
-            'network': self._network_tools,
-            'encode': self._encoding_tools,
-            'time': self._time_tools,
-            'color': self._color_command
-        }
-        
-        if command in command_handlers:
-            return command_handlers[command](arg, script_state)
+        handler = self._dispatch.get(command)
+        if handler is not None:
+            return handler(arg, script_state)
         else:
             print(f"{Colors.WARNING}未知命令: {command}{Colors.RESET}")
             return False
@@ -859,8 +1265,9 @@ class ParameterSystem:
         
         try:
             print(f"{Colors.SUCCESS}系统监控已激活{Colors.RESET}")
-            print(f"CPU使用率: {psutil.cpu_percent()}%")
-            print(f"内存使用率: {psutil.virtual_memory().percent}%")
+            cpu_percent, mem = self.resource_monitor.sample_usage()
+            print(f"CPU使用率: {cpu_percent}%")
+            print(f"内存使用率: {mem.percent}%")
             return True
         except Exception as e:
             print(f"{Colors.WARNING}监控功能受限: {e}{Colors.RESET}")
@@ -873,6 +1280,7 @@ class ParameterSystem:
         
         if arg:
             try:
+                # Bash模式明确要求shell语义，内置命令和语法都交给shell解释
                 result = subprocess.run(arg, shell=True, capture_output=True, text=True)
                 print(result.stdout)
                 if result.stderr:
@@ -892,7 +1300,10 @@ class ParameterSystem:
     def _config_command(self, arg: Optional[str], script_state: ScriptState) -> bool:
         """配置命令"""
         if arg:
-            if '=' in arg:
+            if arg == 'reload':
+                config.reload()
+                print(f"{Colors.SUCCESS}配置已重新加载{Colors.RESET}")
+            elif '=' in arg:
                 key, value = arg.split('=', 1)
                 config.set(key.strip(), value.strip())
                 print(f"{Colors.SUCCESS}配置已更新: {key} = {value}{Colors.RESET}")
@@ -904,7 +1315,7 @@ class ParameterSystem:
                     print(f"{Colors.WARNING}未知配置项: {arg}{Colors.RESET}")
         else:
             print(f"{Colors.HEADER}当前配置:{Colors.RESET}")
-            for key, value in config.data.items():
+            for key, value in config.snapshot().items():
                 print(f"  {Colors.INFO}{key}: {Colors.SYSTEM}{value}{Colors.RESET}")
         
         return True
@@ -947,25 +1358,31 @@ class ParameterSystem:
     def _execute_script(self, script_path: str, options: Dict[str, Any], script_state: ScriptState) -> bool:
         """执行Zetas脚本"""
         print(f"{Colors.INFO}执行脚本: {script_path}{Colors.RESET}")
-        if os.path.exists(script_path):
-            try:
-                with open(script_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                print(f"{Colors.SUCCESS}脚本内容:{Colors.RESET}")
-                print(content[:1000] + "..." if len(content) > 1000 else content)
-                return True
-            except Exception as e:
-                print(f"{Colors.ERROR}读取脚本失败: {e}{Colors.RESET}")
-                return False
-        else:
+        try:
+            # 直接打开，不存在时由异常判断，省去单独的存在性检查
+            # 只预览前1000个字符，多读一个用于判断是否截断
+            with open(script_path, 'r', encoding='utf-8') as f:
+                head = f.read(SCRIPT_PREVIEW_CHARS + 1)
+        except FileNotFoundError:
             print(f"{Colors.ERROR}脚本文件不存在: {script_path}{Colors.RESET}")
             return False
+        except Exception as e:
+            print(f"{Colors.ERROR}读取脚本失败: {e}{Colors.RESET}")
+            return False
+        
+        print(f"{Colors.SUCCESS}脚本内容:{Colors.RESET}")
+        if len(head) > SCRIPT_PREVIEW_CHARS:
+            print(head[:SCRIPT_PREVIEW_CHARS] + "...")
+        else:
+            print(head)
+        return True
     
     def _process_file(self, file_path: str, options: Dict[str, Any], script_state: ScriptState) -> bool:
         """处理文件"""
         print(f"{Colors.INFO}处理文件: {file_path}{Colors.RESET}")
-        if os.path.exists(file_path):
-            print(f"{Colors.SUCCESS}文件存在，大小: {os.path.getsize(file_path)} 字节{Colors.RESET}")
+        st = _safe_stat(file_path)
+        if st is not None:
+            print(f"{Colors.SUCCESS}文件存在，大小: {st.st_size} 字节{Colors.RESET}")
             return True
         else:
             print(f"{Colors.WARNING}文件不存在{Colors.RESET}")
@@ -974,7 +1391,8 @@ class ParameterSystem:
     def _process_directory(self, dir_path: str, options: Dict[str, Any], script_state: ScriptState) -> bool:
         """处理目录"""
         print(f"{Colors.INFO}处理目录: {dir_path}{Colors.RESET}")
-        if os.path.exists(dir_path) and os.path.isdir(dir_path):
+        st = _safe_stat(dir_path)
+        if st is not None and stat.S_ISDIR(st.st_mode):
             print(f"{Colors.SUCCESS}目录存在{Colors.RESET}")
             return True
         else:
@@ -984,13 +1402,18 @@ class ParameterSystem:
     def _execute_program(self, program: str, options: Dict[str, Any], script_state: ScriptState) -> bool:
         """执行程序"""
         print(f"{Colors.INFO}执行程序: {program}{Colors.RESET}")
+        # 子进程直接继承标准输出，先写出已缓冲的内容以保持顺序
+        sys.stdout.flush()
         try:
             # 如果是绝对路径，直接执行
             if os.path.isabs(program):
-                subprocess.run(program, shell=True, check=False)
+                if program.lower().endswith('.py'):
+                    subprocess.run([sys.executable, program], check=False)
+                else:
+                    subprocess.run([program], check=False)
             else:
                 # 尝试在当前目录和PATH中查找
-                subprocess.run(program, shell=True, check=False)
+                _run_command(program, check=False)
             return True
         except Exception as e:
             print(f"{Colors.ERROR}执行失败: {e}{Colors.RESET}")
@@ -1006,15 +1429,20 @@ class ParameterSystem:
         print(f"  当前目录: {Path.cwd()}")
         
         try:
-            print(f"  CPU使用率: {psutil.cpu_percent()}%")
-            mem = psutil.virtual_memory()
+            cpu_percent, mem = self.resource_monitor.sample_usage()
+            print(f"  CPU使用率: {cpu_percent}%")
             print(f"  内存使用率: {mem.percent}% ({mem.used//(1024**3)}GB/{mem.total//(1024**3)}GB)")
         except ImportError:
             print(f"  {Colors.WARNING}psutil未安装，系统信息受限{Colors.RESET}")
     
     def print_help(self):
         """打印简洁帮助信息"""
-        help_text = f"""
+        print(self._help_text)
+    
+    @staticmethod
+    def _render_help() -> str:
+        """生成帮助文本，内容只依赖颜色常量，初始化时生成一次"""
+        return f"""
 {Colors.BANNER}{'='*60}{Colors.RESET}
 {Colors.BANNER}              zetas8.6 Shell 工具箱               {Colors.RESET}
 {Colors.BANNER}{'='*60}{Colors.RESET}
@@ -1059,7 +1487,7 @@ class ParameterSystem:
   {Colors.COMMAND}/p <代码>{Colors.RESET}      - 增强Python环境
   {Colors.COMMAND}/monitor <目标>{Colors.RESET} - ZY监控器
   {Colors.COMMAND}/bash <命令>{Colors.RESET}    - Bash语法支持
-  {Colors.COMMAND}/config [选项]{Colors.RESET}  - 配置管理
+  {Colors.COMMAND}/config [选项]{Colors.RESET}  - 配置管理 (reload 重新加载配置文件)
   {Colors.COMMAND}/color <代码>{Colors.RESET}   - 设置颜色
 
 {Colors.HEADER}多命令支持:{Colors.RESET}
@@ -1073,26 +1501,124 @@ class ParameterSystem:
 
 {Colors.BANNER}{'='*60}{Colors.RESET}
 """
-        print(help_text)
 
 # ==================== 控制台界面 ====================
+# cat 命令的读取块大小，小于该大小的文件一次读完
+CAT_CHUNK_SIZE = 64 * 1024
+
+# find 命令最多显示的结果数
+FIND_DISPLAY_LIMIT = 20
+# find 遍历结果缓存：最多缓存的根目录数、有效期（秒）、所有目录树合计最多缓存的文件数
+# 只检查根目录的修改时间，子目录的外部改动要等缓存过期才能看到，因此有效期很短
+FIND_CACHE_SIZE = 4
+FIND_CACHE_TTL = 5
+FIND_CACHE_MAX_FILES = 20000
+# 不会改动文件、执行后可以保留 find 缓存的内置命令
+FIND_CACHE_SAFE_COMMANDS = frozenset({
+    'find', 'ls', 'dir', 'cat', 'type', 'cd', 'pwd', 'echo', 'color_echo', 'color',
+    'history', 'help', 'sysinfo', 'clear', 'alias', 'unalias', 'ps', 'tasklist',
+    'whoami', 'hostname', 'date', 'time', 'ping', 'ipconfig', 'ifconfig',
+    'netstat', 'base64', 'hex',
+})
+
+# glob 通配符
+GLOB_MAGIC_CHARS = frozenset('*?[')
+
+# base64 命令用于判断输入是否可能是Base64串
+_B64_RE = re.compile(r'^[A-Za-z0-9+/]+={0,2}$')
+
+# hex 命令用于判断输入是否为十六进制串
+_HEX_RE = re.compile(r'^[0-9a-fA-F]+$')
+
+# 各平台系统工具的命令行，启动时按平台确定一次；kill/ping 在末尾追加PID或主机名
+SYSTEM_TOOL_COMMANDS = MappingProxyType({
+    'ps': ('tasklist',) if IS_WINDOWS else ('ps', 'aux'),
+    'kill': ('taskkill', '/F', '/PID') if IS_WINDOWS else ('kill', '-9'),
+    'ping': ('ping',) if IS_WINDOWS else ('ping', '-c', '4'),
+    'ifconfig': ('ipconfig',) if IS_WINDOWS else ('ifconfig',),
+    'netstat': ('netstat', '-an') if IS_WINDOWS else ('netstat', '-tulpn'),
+})
+
+# 退出交互模式的命令
+EXIT_COMMANDS = frozenset({'exit', 'quit', 'q'})
+
+# 由控制台自身处理的命令名，按Tab补全时的显示顺序排列
+BUILTIN_COMMANDS = (
+    'help', 'exit', 'quit', 'q', 'clear', 'sysinfo', 'history',
+    'alias', 'unalias', 'cd', 'pwd', 'ls', 'dir', 'mkdir', 'touch',
+    'rm', 'cp', 'mv', 'find', 'cat', 'type', 'open', 'echo', 'color_echo',
+    'color', 'ps', 'tasklist', 'kill', 'taskkill', 'whoami', 'hostname',
+    'date', 'time', 'ping', 'ipconfig', 'ifconfig', 'netstat', 'base64', 'hex'
+)
+BUILTIN_COMMAND_NAMES = frozenset(BUILTIN_COMMANDS)
+
 class ConsoleInterface:
     """控制台界面"""
     
     def __init__(self):
         self.param_system = ParameterSystem()
         self.running = True
-        self.command_history = []
+        # 最多保留100条，追加时自动丢弃最旧的记录
+        self.command_history = deque(maxlen=COMMAND_HISTORY_SIZE)
         self.history_index = -1
         
-        self.history_file = Path.home() / ".zetas_history"
+        self.history_file = HISTORY_FILE
+        self._banner = self._render_banner()
+        self._update_cwd()
         self.alias_manager = AliasManager()
-        self.resource_monitor = ResourceMonitor()
+        self.resource_monitor = self.param_system.resource_monitor
         self.multi_processor = MultiCommandProcessor(self)
         self.file_opener = FileOpener()
+        # 根目录绝对路径 -> (修改时间, 缓存时间, [(文件名, 路径), ...])
+        self._find_cache: Dict[str, Tuple[Optional[int], float, List[Tuple[str, str]]]] = {}
         self.last_resource_check = 0
         self.resource_check_interval = 60
         
+        # 内置命令分发表：不带参数的命令 / 带参数的命令（处理函数接收去掉命令名后的参数）
+        self._plain_commands = {
+            'history': self._show_command_history,
+            'help': self.param_system.print_help,
+            'sysinfo': self.param_system.print_system_info,
+            'clear': self._clear_screen,
+            'alias': self.alias_manager.list_aliases,
+            'ls': self._list_files,
+            'dir': self._list_files,
+            'pwd': self._show_working_directory,
+            'ps': self._show_process_list,
+            'tasklist': self._show_process_list,
+            'whoami': self._show_current_user,
+            'hostname': self._show_hostname,
+            'date': self._show_date,
+            'time': self._show_time,
+            'ipconfig': self._show_network_config,
+            'ifconfig': self._show_network_config,
+            'netstat': self._show_network_connections,
+        }
+        self._arg_commands = {
+            'cd': self._change_directory,
+            'alias': self._handle_alias_command,
+            'unalias': self._handle_unalias_command,
+            'ls': self._list_files,
+            'dir': self._list_files,
+            'mkdir': self._make_directory,
+            'touch': self._touch_file,
+            'rm': self._remove_file,
+            'cp': self._copy_file,
+            'mv': self._move_file,
+            'find': self._find_file,
+            'cat': self._show_file_content,
+            'type': self._show_file_content,
+            'echo': self._echo_text,
+            'color_echo': self._color_echo_text,
+            'color': self._set_global_color,
+            'open': self._open_file_command,
+            'kill': self._kill_process,
+            'taskkill': self._kill_process,
+            'ping': self._ping_host,
+            'base64': self._base64_encode_decode,
+            'hex': self._hex_encode_decode,
+        }
+        
         self._load_history()
         
         if READLINE_AVAILABLE:
@@ -1101,24 +1627,20 @@ class ConsoleInterface:
     def _setup_tab_completion(self):
         """设置Tab自动补全"""
         try:
+            completion_cache: List[str] = []
+            
             def completer(text, state):
                 line = readline.get_line_buffer().lstrip()
                 
-                if not line or line.startswith(' '):
-                    commands = [
-                        'help', 'exit', 'clear', 'ls', 'cd', 'pwd',
-                        'mkdir', 'touch', 'rm', 'cp', 'mv', 'find', 'cat', 'open',
-                        'ps', 'kill', 'whoami', 'date', 'time',
-                        'ping', 'ipconfig', 'netstat',
-                        'alias', 'unalias', 'history',
-                        'echo', 'color_echo', 'color'
-                    ]
-                    matches = [c for c in commands if c.startswith(text)]
+                # 光标还在第一个词上时补全内置命令，否则补全路径
+                if ' ' not in line:
+                    matches = [c for c in BUILTIN_COMMANDS if c.startswith(text)]
                     return matches[state] if state < len(matches) else None
                 else:
-                    matches = glob.glob(text + '*')
-                    matches = [m + '/' if os.path.isdir(m) else m for m in matches]
-                    return matches[state] if state < len(matches) else None
+                    # readline 对每个候选都会以递增的 state 调用一次，只在 state 为0时计算
+                    if state == 0:
+                        completion_cache[:] = self._complete_path(text)
+                    return completion_cache[state] if state < len(completion_cache) else None
             
             readline.set_completer(completer)
             
@@ -1130,27 +1652,78 @@ class ConsoleInterface:
         except Exception:
             pass
     
+    @staticmethod
+    def _complete_path(text: str) -> List[str]:
+        """补全路径：普通前缀用 scandir 过滤，含通配符时交给 glob"""
+        if GLOB_MAGIC_CHARS.intersection(text):
+            return [m + '/' if os.path.isdir(m) else m for m in glob.glob(text + '*')]
+        
+        directory, base = os.path.split(text)
+        # 与 glob 一致：前缀不以点开头时不补全隐藏文件
+        show_hidden = base.startswith('.')
+        matches = []
+        try:
+            with os.scandir(directory or '.') as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith(base) and (show_hidden or name[0] != '.'):
+                        path = os.path.join(directory, name)
+                        matches.append(path + '/' if entry.is_dir() else path)
+        except OSError:
+            pass
+        return matches
+    
     def _load_history(self):
         """加载历史记录"""
+        if READLINE_AVAILABLE:
+            # 只在交互模式下由 readline 一次性读入历史文件，退出时再由它写回
+            readline.set_history_length(HISTORY_LENGTH)
+            try:
+                readline.read_history_file(str(self.history_file))
+            except Exception:
+                pass
+            atexit.register(_write_readline_history)
+            
+            length = readline.get_current_history_length()
+            items = (readline.get_history_item(i)
+                     for i in range(max(1, length - COMMAND_HISTORY_SIZE + 1), length + 1))
+            self.command_history.extend(item for item in items if item)
+            return
+        
         if self.history_file.exists():
             try:
                 with open(self.history_file, 'r', encoding='utf-8') as f:
-                    self.command_history = [line.strip() for line in f.readlines()[-100:]]
+                    self.command_history.extend(line.strip() for line in f)
             except Exception:
-                self.command_history = []
+                self.command_history.clear()
     
     def _save_history(self):
         """保存历史记录到文件"""
+        if READLINE_AVAILABLE:
+            # 由 atexit 注册的 readline 写入处理
+            return
+        
         try:
             with open(self.history_file, 'w', encoding='utf-8') as f:
-                for cmd in self.command_history[-100:]:
+                for cmd in self.command_history:
                     f.write(cmd + '\n')
         except Exception:
             pass
     
+    def _update_cwd(self):
+        """刷新缓存的工作目录和提示符，只在目录可能变化后调用"""
+        self._cwd = os.getcwd()
+        display_cwd = "..." + self._cwd[-37:] if len(self._cwd) > 40 else self._cwd
+        self._prompt = f"{Colors.PROMPT}zetas:{display_cwd}>{Colors.RESET} "
+    
     def print_banner(self):
         """打印横幅"""
-        banner = f"""
+        print(self._banner)
+    
+    @staticmethod
+    def _render_banner() -> str:
+        """生成横幅文本"""
+        return f"""
 {Colors.BANNER}{'='*60}{Colors.RESET}
 {Colors.BANNER}        zetas8.6 Shell 工具箱        {Colors.RESET}
 {Colors.BANNER}         版本 8.6 (增强版)          {Colors.RESET}
@@ -1159,7 +1732,6 @@ class ConsoleInterface:
 {Colors.INFO}输入 'help' 查看帮助{Colors.RESET}
 {Colors.INFO}支持多命令执行: 使用 + 分隔命令{Colors.RESET}
 """
-        print(banner)
     
     def run_interactive(self):
         """运行交互式模式"""
@@ -1167,17 +1739,8 @@ class ConsoleInterface:
         
         while self.running:
             try:
-                cwd = Path.cwd()
-                
-                if len(str(cwd)) > 40:
-                    display_cwd = "..." + str(cwd)[-37:]
-                else:
-                    display_cwd = str(cwd)
-                
-                prompt = f"{Colors.PROMPT}zetas:{display_cwd}>{Colors.RESET} "
-                
                 try:
-                    user_input = input(prompt).strip()
+                    user_input = input(self._prompt).strip()
                 except EOFError:
                     print(f"\n{Colors.INFO}再见！{Colors.RESET}")
                     break
@@ -1189,11 +1752,9 @@ class ConsoleInterface:
                     continue
                 
                 self.command_history.append(user_input)
-                if len(self.command_history) > 100:
-                    self.command_history.pop(0)
                 self.history_index = -1
                 
-                if user_input.lower() in ['exit', 'quit', 'q']:
+                if user_input.lower() in EXIT_COMMANDS:
                     self._save_history()
                     print(f"{Colors.INFO}再见！{Colors.RESET}")
                     break
@@ -1207,7 +1768,6 @@ class ConsoleInterface:
     
     def process_command(self, command: str):
         """处理命令（支持多命令）"""
-        import time
         start_time = time.time()
         
         # 检查是否包含多个命令
@@ -1231,81 +1791,32 @@ class ConsoleInterface:
                 print(f"{Colors.INFO}执行别名: {command} -> {expanded_command}{Colors.RESET}")
                 command = expanded_command
             
-            cmd_lower = command.lower()
-            
-            if cmd_lower == 'history':
-                self._show_command_history()
-            elif cmd_lower == 'help':
-                self.param_system.print_help()
-            elif cmd_lower == 'sysinfo':
-                self.param_system.print_system_info()
-            elif cmd_lower == 'clear':
-                os.system('cls' if os.name == 'nt' else 'clear')
-                self.print_banner()
-            elif command.startswith('/'):
+            head, sep, rest = command.partition(' ')
+            head_lower = head.lower()
+            # 除只读命令外，任何命令都可能改动文件，使 find 的遍历缓存失效
+            if self._find_cache and head_lower not in FIND_CACHE_SAFE_COMMANDS:
+                self._find_cache.clear()
+            
+            if command.startswith('/'):
                 parts = command[1:].split(maxsplit=1)
                 cmd = parts[0] if parts else ''
                 arg = parts[1] if len(parts) > 1 else None
                 self.param_system._execute_command(cmd, arg, script_state)
-            elif cmd_lower.startswith('cd '):
-                self._change_directory(command)
-            elif cmd_lower.startswith('alias '):
-                self._handle_alias_command(command)
-            elif cmd_lower == 'alias':
-                self.alias_manager.list_aliases()
-            elif cmd_lower.startswith('unalias '):
-                self._handle_unalias_command(command)
-            elif cmd_lower.startswith('ls') or cmd_lower.startswith('dir'):
-                self._list_files(command)
-            elif cmd_lower.startswith('mkdir '):
-                self._make_directory(command)
-            elif cmd_lower.startswith('touch '):
-                self._touch_file(command)
-            elif cmd_lower.startswith('rm '):
-                self._remove_file(command)
-            elif cmd_lower.startswith('cp '):
-                self._copy_file(command)
-            elif cmd_lower.startswith('mv '):
-                self._move_file(command)
-            elif cmd_lower.startswith('find '):
-                self._find_file(command)
-            elif cmd_lower.startswith('cat ') or cmd_lower.startswith('type '):
-                self._show_file_content(command)
-            elif cmd_lower.startswith('echo '):
-                self._echo_text(command)
-            elif cmd_lower.startswith('color_echo '):
-                self._color_echo_text(command)
-            elif cmd_lower.startswith('color '):
-                self._set_global_color(command)
-            elif cmd_lower.startswith('open '):
-                self._open_file_command(command)
-            elif cmd_lower == 'pwd':
-                print(f"{Colors.INFO}当前目录: {Path.cwd()}{Colors.RESET}")
-            elif cmd_lower == 'ps' or cmd_lower == 'tasklist':
-                self._show_process_list()
-            elif cmd_lower.startswith('kill ') or cmd_lower.startswith('taskkill '):
-                self._kill_process(command)
-            elif cmd_lower == 'whoami':
-                self._show_current_user()
-            elif cmd_lower == 'hostname':
-                self._show_hostname()
-            elif cmd_lower == 'date':
-                self._show_date()
-            elif cmd_lower == 'time':
-                self._show_time()
-            elif cmd_lower.startswith('ping '):
-                self._ping_host(command)
-            elif cmd_lower == 'ipconfig' or cmd_lower == 'ifconfig':
-                self._show_network_config()
-            elif cmd_lower == 'netstat':
-                self._show_network_connections()
-            elif cmd_lower.startswith('base64 '):
-                self._base64_encode_decode(command)
-            elif cmd_lower.startswith('hex '):
-                self._hex_encode_decode(command)
+                # Python环境或脚本中可能调用了 os.chdir，需要同步缓存的目录
+                if os.getcwd() != self._cwd:
+                    _which_cached.cache_clear()
+                    self._update_cwd()
+                return
+            
+            # 按第一个词查表：无参数命令要求整行匹配，带参数命令要求命令名后有空格
+            # 带参数的处理函数只接收命令名之后的参数部分
+            if sep and head_lower in self._arg_commands:
+                self._arg_commands[head_lower](rest.strip())
+            elif not sep and head_lower in self._plain_commands:
+                self._plain_commands[head_lower]()
             else:
                 # 尝试作为可执行文件执行
-                if os.path.exists(command) or self._is_executable_in_path(command):
+                if self._is_executable_in_path(command):
                     self._run_executable(command)
                 else:
                     return_code = self._execute_system_command(command)
@@ -1316,96 +1827,147 @@ class ConsoleInterface:
         except Exception as e:
             print(f"{Colors.ERROR}执行错误: {e}{Colors.RESET}")
     
+    def _clear_screen(self):
+        """清屏"""
+        os.system('cls' if IS_WINDOWS else 'clear')
+        self.print_banner()
+    
+    def _show_working_directory(self):
+        """显示当前目录"""
+        print(f"{Colors.INFO}当前目录: {os.getcwd()}{Colors.RESET}")
+    
+    def _is_external_command(self, command: str) -> bool:
+        """已展开别名的命令是否交给系统执行，而不是内置命令"""
+        if not command or command.startswith('/'):
+            return False
+        return command.partition(' ')[0].lower() not in BUILTIN_COMMAND_NAMES
+    
     def _is_executable_in_path(self, command: str) -> bool:
         """检查命令是否在PATH中"""
-        if os.path.exists(command):
-            return True
-        
-        # 检查系统PATH
-        path_dirs = os.environ.get('PATH', '').split(os.pathsep)
-        for dir_path in path_dirs:
-            full_path = os.path.join(dir_path, command)
-            if os.path.exists(full_path):
-                return True
-        
-        return False
+        return os.path.exists(command) or _which_cached(command) is not None
     
     def _run_executable(self, command: str):
         """运行可执行文件"""
         try:
             print(f"{Colors.INFO}执行程序: {command}{Colors.RESET}")
+            # 子进程直接继承标准输出，先写出已缓冲的内容以保持顺序
+            sys.stdout.flush()
             
             # 如果是Python脚本，用Python解释器执行
             if command.endswith('.py'):
                 subprocess.run([sys.executable, command], check=False)
             else:
                 # 其他可执行文件
-                subprocess.run(command, shell=True, check=False)
+                _run_command(command, check=False)
             
             print(f"{Colors.SUCCESS}程序执行完成{Colors.RESET}")
         except Exception as e:
             print(f"{Colors.ERROR}执行失败: {e}{Colors.RESET}")
     
-    def _execute_system_command(self, command: str, timeout: int = 30):
-        """执行系统命令"""
+    def _execute_system_command(self, command: str, timeout: int = 30, max_runtime: int = 600):
+        """执行系统命令，输出边产生边显示
+
+        timeout 为无输出的空闲超时，max_runtime 为总运行时间上限（秒）
+        """
+        encoding = SYSTEM_ENCODING
         try:
-            if os.name == 'nt':
-                # Windows 使用 GBK 编码
-                result = subprocess.run(
-                    command,
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    encoding='gbk',  # Windows 中文系统使用 GBK
-                    errors='replace',  # 用问号替换无法解码的字符
-                    timeout=timeout
-                )
-            else:
-                import shlex
-                args = shlex.split(command)
-                # Linux/macOS 使用 UTF-8
-                result = subprocess.run(
-                    args,
-                    capture_output=True,
-                    text=True,
-                    encoding='utf-8',
-                    errors='replace',
-                    timeout=timeout
-                )
-            
-            if result.stdout:
-                print(result.stdout)
-            
-            if result.stderr:
-                print(f"{Colors.ERROR}{result.stderr}{Colors.RESET}")
-            
-            return result.returncode
+            args, use_shell = _split_command(command)
+            proc = subprocess.Popen(args, shell=use_shell,
+                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+        except FileNotFoundError:
+            print(f"{Colors.ERROR}命令未找到: {command}{Colors.RESET}")
+            return -1
+        except Exception as e:
+            print(f"{Colors.ERROR}命令执行错误: {e}{Colors.RESET}")
+            return -1
+        
+        try:
+            if IS_WINDOWS:
+                # Windows 上 select 不支持管道，退回一次性读取
+                stdout, stderr = proc.communicate(timeout=timeout)
+                if stdout:
+                    print(stdout.decode(encoding, 'replace'))
+                if stderr:
+                    print(f"{Colors.ERROR}{stderr.decode(encoding, 'replace')}{Colors.RESET}")
+                return proc.returncode
+            
+            if not self._stream_process_output(proc, encoding, timeout, max_runtime):
+                proc.kill()
+                proc.wait()
+                print(f"{Colors.ERROR}命令执行超时{Colors.RESET}")
+                return -1
+            return proc.wait()
             
         except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
             print(f"{Colors.ERROR}命令执行超时{Colors.RESET}")
             return -1
-        except FileNotFoundError:
-            print(f"{Colors.ERROR}命令未找到: {command}{Colors.RESET}")
-            return -1
         except Exception as e:
+            proc.kill()
+            proc.wait()
             print(f"{Colors.ERROR}命令执行错误: {e}{Colors.RESET}")
             return -1
+        finally:
+            proc.stdout.close()
+            proc.stderr.close()
+    
+    def _stream_process_output(self, proc: subprocess.Popen, encoding: str,
+                               idle_timeout: float, max_runtime: float) -> bool:
+        """用 select 轮询子进程的输出管道并实时写出，超时返回False
+
+        输出不在内存中累积，内存占用与输出量无关
+        """
+        out_fd, err_fd = proc.stdout.fileno(), proc.stderr.fileno()
+        # 增量解码，避免多字节字符被4096字节的分块切断
+        decoders = {
+            out_fd: codecs.getincrementaldecoder(encoding)('replace'),
+            err_fd: codecs.getincrementaldecoder(encoding)('replace'),
+        }
+        open_fds = [out_fd, err_fd]
+        start = last_output = time.monotonic()
+        
+        while open_fds:
+            ready, _, _ = select.select(open_fds, [], [], 0.1)
+            now = time.monotonic()
+            
+            for fd in ready:
+                chunk = os.read(fd, 4096)
+                if not chunk:
+                    open_fds.remove(fd)
+                    text = decoders[fd].decode(b'', final=True)
+                else:
+                    last_output = now
+                    text = decoders[fd].decode(chunk)
+                if not text:
+                    continue
+                if fd == out_fd:
+                    sys.stdout.write(text)
+                else:
+                    sys.stdout.write(f"{Colors.ERROR}{text}{Colors.RESET}")
+                sys.stdout.flush()
+            
+            if now - last_output > idle_timeout or now - start > max_runtime:
+                return False
+        
+        return True
     
-    def _change_directory(self, command: str):
+    def _change_directory(self, arg: str):
         """切换目录"""
         try:
-            target = command[3:].strip()
-            if not target:
-                target = str(Path.home())
+            target = arg or str(HOME_DIR)
             
             os.chdir(target)
-            print(f"{Colors.SUCCESS}切换到: {Path.cwd()}{Colors.RESET}")
+            # PATH 中可能有相对目录，切换目录后查找结果不再可靠
+            _which_cached.cache_clear()
+            self._update_cwd()
+            print(f"{Colors.SUCCESS}切换到: {self._cwd}{Colors.RESET}")
         except Exception as e:
             print(f"{Colors.ERROR}切换目录失败: {e}{Colors.RESET}")
     
-    def _handle_alias_command(self, command: str):
+    def _handle_alias_command(self, arg: str):
         """处理alias命令"""
-        parts = command[6:].strip().split('=', 1)
+        parts = arg.split('=', 1)
         if len(parts) != 2:
             print(f"{Colors.ERROR}用法: alias 名称=命令{Colors.RESET}")
             return
@@ -1419,9 +1981,9 @@ class ConsoleInterface:
         
         self.alias_manager.add_alias(name, cmd)
     
-    def _handle_unalias_command(self, command: str):
+    def _handle_unalias_command(self, arg: str):
         """处理unalias命令"""
-        name = command[8:].strip()
+        name = arg
         if not name:
             print(f"{Colors.ERROR}用法: unalias 别名名称{Colors.RESET}")
             return
@@ -1441,21 +2003,22 @@ class ConsoleInterface:
             print(f"{Colors.INFO}没有命令历史{Colors.RESET}")
             return
         
-        print(f"{Colors.HEADER}命令历史:{Colors.RESET}")
-        for i, cmd in enumerate(self.command_history[-20:], 1):
-            print(f"  {i:3d}: {cmd}")
+        recent = islice(self.command_history, max(0, len(self.command_history) - 20), None)
+        lines = [f"{Colors.HEADER}命令历史:{Colors.RESET}"]
+        lines.extend(f"  {i:3d}: {cmd}" for i, cmd in enumerate(recent, 1))
+        sys.stdout.write('\n'.join(lines) + '\n')
     
-    def _list_files(self, command: str):
+    def _list_files(self, arg: str = ''):
         """列出文件"""
-        parts = command.split()
+        parts = arg.split()
         target = '.'
         
-        if len(parts) > 1:
-            if parts[1].startswith('-'):
-                if len(parts) > 2:
-                    target = parts[2]
+        if parts:
+            if parts[0].startswith('-'):
+                if len(parts) > 1:
+                    target = parts[1]
             else:
-                target = parts[1]
+                target = parts[0]
         
         try:
             if not os.path.exists(target):
@@ -1463,24 +2026,35 @@ class ConsoleInterface:
                 return
             
             if os.path.isdir(target):
-                items = os.listdir(target)
-                for item in items:
-                    full_path = os.path.join(target, item)
-                    if os.path.isdir(full_path):
-                        print(f"{Colors.INFO}{item}/{Colors.RESET}")
-                    elif os.access(full_path, os.X_OK):
-                        print(f"{Colors.SUCCESS}{item}*{Colors.RESET}")
-                    else:
-                        print(item)
+                dir_fmt = Colors.INFO + '{}/' + Colors.RESET
+                exec_fmt = Colors.SUCCESS + '{}*' + Colors.RESET
+                lines = []
+                # scandir 自带文件类型信息，目录无需额外stat
+                with os.scandir(target) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            lines.append(dir_fmt.format(entry.name))
+                            continue
+                        try:
+                            executable = entry.stat().st_mode & 0o111
+                        except OSError:
+                            executable = False
+                        if executable:
+                            lines.append(exec_fmt.format(entry.name))
+                        else:
+                            lines.append(entry.name)
+                # 目录列表一次写出
+                if lines:
+                    sys.stdout.write('\n'.join(lines) + '\n')
             else:
                 print(f"{Colors.INFO}{target}{Colors.RESET}")
         except Exception as e:
             print(f"{Colors.ERROR}列出文件失败: {e}{Colors.RESET}")
     
-    def _make_directory(self, command: str):
+    def _make_directory(self, arg: str):
         """创建目录"""
         try:
-            dir_name = command[6:].strip()
+            dir_name = arg
             if not dir_name:
                 print(f"{Colors.ERROR}用法: mkdir <目录名>{Colors.RESET}")
                 return
@@ -1490,34 +2064,35 @@ class ConsoleInterface:
         except Exception as e:
             print(f"{Colors.ERROR}创建目录失败: {e}{Colors.RESET}")
     
-    def _touch_file(self, command: str):
+    def _touch_file(self, arg: str):
         """创建文件"""
         try:
-            files = command[6:].strip().split()
+            files = arg.split()
             if not files:
                 print(f"{Colors.ERROR}用法: touch <文件1> [文件2] ...{Colors.RESET}")
                 return
             
             for file_name in files:
                 try:
-                    if os.path.exists(file_name):
+                    # O_EXCL 让创建和存在性检查合并为一次open调用
+                    try:
+                        fd = os.open(file_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                    except FileExistsError:
                         # 更新修改时间
                         os.utime(file_name, None)
                         print(f"{Colors.INFO}已更新修改时间: {file_name}{Colors.RESET}")
                     else:
-                        # 创建空文件
-                        with open(file_name, 'w', encoding='utf-8') as f:
-                            pass
+                        os.close(fd)
                         print(f"{Colors.SUCCESS}文件已创建: {file_name}{Colors.RESET}")
                 except Exception as e:
                     print(f"{Colors.ERROR}创建文件失败 {file_name}: {e}{Colors.RESET}")
         except Exception as e:
             print(f"{Colors.ERROR}操作失败: {e}{Colors.RESET}")
     
-    def _remove_file(self, command: str):
+    def _remove_file(self, arg: str):
         """删除文件"""
         try:
-            parts = command[3:].strip().split()
+            parts = arg.split()
             if not parts:
                 print(f"{Colors.ERROR}用法: rm <文件名>{Colors.RESET}")
                 return
@@ -1544,10 +2119,10 @@ class ConsoleInterface:
         except Exception as e:
             print(f"{Colors.ERROR}删除文件失败: {e}{Colors.RESET}")
     
-    def _copy_file(self, command: str):
+    def _copy_file(self, arg: str):
         """复制文件"""
         try:
-            parts = command[3:].strip().split()
+            parts = arg.split()
             if len(parts) < 2:
                 print(f"{Colors.ERROR}用法: cp <源文件> <目标文件>{Colors.RESET}")
                 return
@@ -1556,11 +2131,12 @@ class ConsoleInterface:
             dst = parts[1]
             show_progress = '-p' in parts
             
-            if not os.path.exists(src):
+            st = _safe_stat(src)
+            if st is None:
                 print(f"{Colors.ERROR}源文件不存在: {src}{Colors.RESET}")
                 return
             
-            file_size = os.path.getsize(src)
+            file_size = st.st_size
             
             if show_progress and file_size > 10 * 1024 * 1024:
                 success = ProgressManager.copy_with_progress(src, dst)
@@ -1577,10 +2153,10 @@ class ConsoleInterface:
             print(f"{Colors.ERROR}复制文件失败: {e}{Colors.RESET}")
             return False
     
-    def _move_file(self, command: str):
+    def _move_file(self, arg: str):
         """移动文件"""
         try:
-            parts = command[3:].strip().split()
+            parts = arg.split()
             if len(parts) < 2:
                 print(f"{Colors.ERROR}用法: mv <源文件> <目标文件>{Colors.RESET}")
                 return
@@ -1596,115 +2172,206 @@ class ConsoleInterface:
         except Exception as e:
             print(f"{Colors.ERROR}移动文件失败: {e}{Colors.RESET}")
     
-    def _find_file(self, command: str):
+    @staticmethod
+    def _iter_files(root: str):
+        """深度优先遍历目录树，逐个产出 (文件名, 路径)"""
+        if HAS_FWALK:
+            # POSIX 上 fwalk 基于已打开的目录描述符逐级打开子目录，不必每次解析完整路径
+            for dir_path, _, files, _ in os.fwalk(root):
+                for name in files:
+                    yield name, os.path.join(dir_path, name)
+            return
+        
+        stack = [root]
+        while stack:
+            subdirs = []
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            # 与 os.walk 一致，不进入符号链接目录
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        else:
+                            yield entry.name, entry.path
+            except OSError:
+                continue
+            # 逆序压栈，保持按目录顺序深度优先遍历
+            stack.extend(reversed(subdirs))
+    
+    def _cached_files(self, root: str):
+        """返回 (文件迭代器, 是否来自缓存)，同一会话内连续查找时复用上次的遍历结果
+
+        根目录修改时间变化、超过 FIND_CACHE_TTL 或本程序修改过文件时重新遍历
+        """
+        key = os.path.abspath(root)
+        st = _safe_stat(root)
+        mtime = st.st_mtime_ns if st is not None else None
+        now = time.monotonic()
+        
+        cached = self._find_cache.pop(key, None)
+        if cached is not None and cached[0] == mtime and now - cached[1] < FIND_CACHE_TTL:
+            self._find_cache[key] = cached
+            return cached[2], True
+        
+        return self._record_files(root, key, mtime, now), False
+    
+    def _record_files(self, root: str, key: str, mtime: Optional[int], now: float):
+        """边遍历边记录文件，只有完整遍历且未超过缓存上限时才写入缓存"""
+        files = []
+        for item in self._iter_files(root):
+            if files is not None:
+                files.append(item)
+                if len(files) > FIND_CACHE_MAX_FILES:
+                    # 目录树太大时不缓存，继续遍历剩余部分
+                    files = None
+            yield item
+        
+        if files is None:
+            return
+        # 只保留最近使用的几个根目录，且合计文件数不超过上限
+        total = len(files)
+        for entry in self._find_cache.values():
+            total += len(entry[2])
+        while self._find_cache and (len(self._find_cache) >= FIND_CACHE_SIZE
+                                    or total > FIND_CACHE_MAX_FILES):
+            total -= len(self._find_cache.pop(next(iter(self._find_cache)))[2])
+        self._find_cache[key] = (mtime, now, files)
+    
+    def _find_file(self, arg: str):
         """查找文件"""
         try:
-            pattern = command[5:].strip()
+            pattern = arg
             if not pattern:
                 print(f"{Colors.ERROR}用法: find <模式>{Colors.RESET}")
                 return
             
-            matches = []
-            for root, dirs, files in os.walk('.'):
-                for file in files:
-                    if pattern in file:
-                        matches.append(os.path.join(root, file))
+            # 含通配符时按glob匹配，否则按子串匹配；匹配函数只构建一次
+            if GLOB_MAGIC_CHARS.intersection(pattern):
+                flags = re.IGNORECASE if IS_WINDOWS else 0
+                is_match = re.compile(fnmatch.translate(pattern), flags).match
+            elif pattern == pattern.lower() and pattern != pattern.upper():
+                # 全小写的模式按智能大小写处理，忽略文件名的大小写；
+                # 模式和文件名都是纯ASCII时 lower() 与 casefold() 结果相同，
+                # 否则仍用 casefold（例如 'ss' 要能匹配 'Straße'）
+                folded = pattern.casefold()
+                if pattern.isascii():
+                    is_match = lambda name: folded in (name.lower() if name.isascii()
+                                                       else name.casefold())
+                else:
+                    is_match = lambda name: folded in name.casefold()
+            else:
+                # 含大写字母或不含字母（如 '.7z'、'2024'）时直接子串匹配，不转换文件名
+                is_match = lambda name: pattern in name
+            
+            # 多取一个结果用于判断是否还有更多，找够后立即停止遍历
+            files, from_cache = self._cached_files('.')
+            found = (path for name, path in files if is_match(name))
+            matches = list(islice(found, FIND_DISPLAY_LIMIT + 1))
+            has_more = len(matches) > FIND_DISPLAY_LIMIT
+            del matches[FIND_DISPLAY_LIMIT:]
             
             if matches:
-                print(f"{Colors.SUCCESS}找到 {len(matches)} 个文件:{Colors.RESET}")
-                for match in matches[:20]:
-                    print(f"  {match}")
-                if len(matches) > 20:
-                    print(f"{Colors.INFO}... 还有 {len(matches)-20} 个结果未显示{Colors.RESET}")
+                # 整个列表拼成一次写入
+                note = " (缓存结果)" if from_cache else ""
+                if has_more:
+                    header = f"找到超过 {FIND_DISPLAY_LIMIT} 个文件{note}:"
+                else:
+                    header = f"找到 {len(matches)} 个文件{note}:"
+                lines = [f"{Colors.SUCCESS}{header}{Colors.RESET}"]
+                lines.extend(f"  {match}" for match in matches)
+                if has_more:
+                    lines.append(f"{Colors.INFO}... 还有更多结果未显示{Colors.RESET}")
+                sys.stdout.write('\n'.join(lines) + '\n')
             else:
-                print(f"{Colors.WARNING}未找到匹配的文件{Colors.RESET}")
+                note = " (缓存结果)" if from_cache else ""
+                print(f"{Colors.WARNING}未找到匹配的文件{note}{Colors.RESET}")
         except Exception as e:
             print(f"{Colors.ERROR}查找文件失败: {e}{Colors.RESET}")
     
-    def _show_file_content(self, command: str):
+    def _show_file_content(self, arg: str):
         """显示文件内容"""
         try:
-            if command.lower().startswith('cat '):
-                file_name = command[4:].strip()
-            else:
-                file_name = command[5:].strip()
+            file_name = arg
             
             if not file_name:
                 print(f"{Colors.ERROR}用法: cat <文件名>{Colors.RESET}")
                 return
             
-            if os.path.exists(file_name):
-                with open(file_name, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                print(content)
-            else:
+            try:
+                f = open(file_name, 'rb', buffering=CAT_CHUNK_SIZE)
+            except FileNotFoundError:
                 print(f"{Colors.ERROR}文件不存在: {file_name}{Colors.RESET}")
+                return
+            
+            with f:
+                size = os.fstat(f.fileno()).st_size
+                if size < CAT_CHUNK_SIZE:
+                    print(f.read().decode('utf-8'))
+                elif IS_WINDOWS:
+                    # Windows 控制台需要转换为控制台编码，按文本分块输出
+                    shutil.copyfileobj(io.TextIOWrapper(f, encoding='utf-8'), sys.stdout, CAT_CHUNK_SIZE)
+                    print()
+                else:
+                    # 大文件按块直接写入底层字节流，不解码再编码，内存占用固定
+                    sys.stdout.flush()
+                    out = sys.stdout.buffer
+                    shutil.copyfileobj(f, out, CAT_CHUNK_SIZE)
+                    out.write(b'\n')
+                    out.flush()
         except Exception as e:
             print(f"{Colors.ERROR}读取文件失败: {e}{Colors.RESET}")
     
-    def _echo_text(self, command: str):
+    def _echo_text(self, arg: str):
         """输出文字"""
-        text = command[5:].strip()
-        print(text)
+        print(arg)
     
-    def _color_echo_text(self, command: str):
+    def _color_echo_text(self, arg: str):
         """带颜色的文字输出"""
         try:
-            text = command[11:].strip()
+            text = arg
+            
+            cmap = Colors.COLOR_MAP
+            reset = Colors.RESET
             
             # 解析颜色格式: color:文本 或 bg:color:文本
-            if ':' in text:
-                parts = text.split(':', 1)
-                if len(parts) == 2:
-                    color_spec, content = parts
-                    
-                    if ':' in color_spec:
-                        # 背景色和前景色: bg:color:文本
-                        bg_color, fg_color = color_spec.split(':', 1)
-                        bg_code = Colors.COLOR_MAP.get(f'bg_{bg_color}', Colors.RESET)
-                        fg_code = Colors.COLOR_MAP.get(fg_color, Colors.RESET)
-                        print(bg_code + fg_code + content + Colors.RESET)
-                    else:
-                        # 只有前景色: color:文本
-                        color_code = Colors.COLOR_MAP.get(color_spec, Colors.RESET)
-                        print(color_code + content + Colors.RESET)
-                else:
-                    print(text)
+            first, sep, content = text.partition(':')
+            if not sep:
+                sys.stdout.write(f"{text}\n")
+                return
+            
+            second, sep, rest = content.partition(':')
+            if sep and f'bg_{first}' in cmap and second in cmap:
+                # 背景色和前景色: bg:color:文本
+                sys.stdout.write(f"{cmap[f'bg_{first}']}{cmap[second]}{rest}{reset}\n")
             else:
-                print(text)
+                # 只有前景色: color:文本
+                sys.stdout.write(f"{cmap.get(first, reset)}{content}{reset}\n")
         except Exception as e:
             print(f"{Colors.ERROR}颜色输出失败: {e}{Colors.RESET}")
     
-    def _set_global_color(self, command: str):
+    def _set_global_color(self, arg: str):
         """设置全局颜色"""
-        color_code = command[6:].strip()
+        color_code = arg
         if color_code:
             self.param_system.color_manager.set_color(color_code)
         else:
             print(f"{Colors.INFO}用法: color <颜色代码>{Colors.RESET}")
             print(f"{Colors.INFO}示例: color 0A (黑色背景，绿色文字){Colors.RESET}")
     
-    def _open_file_command(self, command: str):
+    def _open_file_command(self, arg: str):
         """打开文件命令"""
         try:
             # 解析命令: open 文件路径 {程序路径}
-            parts = command[5:].strip().split('{', 1)
-            file_part = parts[0].strip()
-            
-            program_path = None
-            if len(parts) > 1:
-                program_part = parts[1].rstrip('}')
-                program_path = program_part.strip()
-            
-            # 支持多个文件，用空格分隔
-            files = file_part.split()
+            file_part, sep, program_part = arg.partition('{')
+            program_path = program_part.rstrip('}').strip() if sep else None
             
-            for file_path in files:
-                if file_path:  # 跳过空字符串
-                    print(f"{Colors.INFO}打开文件: {file_path}{Colors.RESET}")
-                    success = self.file_opener.open_file(file_path, program_path)
-                    if not success:
-                        print(f"{Colors.WARNING}文件打开失败: {file_path}{Colors.RESET}")
+            # 支持多个文件，用空格分隔；split() 已去掉空字符串
+            for file_path in file_part.split():
+                print(f"{Colors.INFO}打开文件: {file_path}{Colors.RESET}")
+                success = self.file_opener.open_file(file_path, program_path)
+                if not success:
+                    print(f"{Colors.WARNING}文件打开失败: {file_path}{Colors.RESET}")
         
         except Exception as e:
             print(f"{Colors.ERROR}打开文件失败: {e}{Colors.RESET}")
@@ -1712,32 +2379,69 @@ class ConsoleInterface:
     def _show_process_list(self):
         """显示进程列表"""
         try:
-            if os.name == 'nt':
-                result = subprocess.run(['tasklist'], capture_output=True, text=True, encoding='gbk', shell=True)
-            else:
-                result = subprocess.run(['ps', 'aux'], capture_output=True, text=True, encoding='utf-8')
-            
-            if result.stdout:
-                print(result.stdout)
-            if result.stderr:
-                print(f"{Colors.ERROR}{result.stderr}{Colors.RESET}")
+            rows = []
+            for proc in psutil.process_iter():
+                try:
+                    # oneshot 内多次读取进程属性只解析一次 /proc 或系统调用
+                    with proc.oneshot():
+                        cpu_times = proc.cpu_times()
+                        rows.append((proc.pid, proc.name(), proc.status(),
+                                     proc.memory_percent(), cpu_times.user + cpu_times.system))
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+        except Exception:
+            # psutil 不可用时退回系统命令
+            self._show_process_list_command()
+            return
+        
+        lines = [f"{Colors.HEADER}{'PID':>7}  {'名称':<26}{'状态':<10}{'内存%':>5}{'CPU时间':>8}{Colors.RESET}"]
+        for pid, name, status, mem_percent, cpu_time in rows:
+            lines.append(f"{pid:>7}  {name[:27]:<28}{status:<12}{mem_percent:>7.1f}{cpu_time:>10.1f}")
+        lines.append(f"{Colors.INFO}共 {len(rows)} 个进程{Colors.RESET}")
+        print('\n'.join(lines))
+    
+    def _run_tool(self, argv: Tuple[str, ...], capture_stdout: bool = True) -> subprocess.CompletedProcess:
+        """运行系统工具并捕获输出，直接启动程序而不经过shell
+
+        capture_stdout 为False时子进程直接继承本进程的标准输出，只捕获错误输出
+        """
+        # PATH 查找有缓存，工具不存在时给出明确的错误而不是系统报错
+        if _which_cached(argv[0]) is None:
+            raise FileNotFoundError(f"命令未找到: {argv[0]}")
+        if not capture_stdout:
+            # 先刷新已缓冲的输出，保证与子进程的输出顺序一致
+            sys.stdout.flush()
+            return subprocess.run(argv, stderr=subprocess.PIPE, text=True, encoding=SYSTEM_ENCODING)
+        return subprocess.run(argv, capture_output=True, text=True, encoding=SYSTEM_ENCODING)
+    
+    def _show_tool_output(self, argv: Tuple[str, ...]):
+        """运行只需原样显示输出的系统工具，输出不经过Python解码再编码"""
+        result = self._run_tool(argv, capture_stdout=False)
+        if result.stderr:
+            print(f"{Colors.ERROR}{result.stderr}{Colors.RESET}")
+    
+    def _show_process_list_command(self):
+        """通过系统命令显示进程列表"""
+        try:
+            self._show_tool_output(SYSTEM_TOOL_COMMANDS['ps'])
         except Exception as e:
             print(f"{Colors.ERROR}获取进程列表失败: {e}{Colors.RESET}")
     
-    def _kill_process(self, command: str):
+    def _kill_process(self, arg: str):
         """结束进程"""
         try:
-            parts = command.split()
-            if len(parts) < 2:
+            # 只需要第一个参数，不必拆分整行
+            pid = arg.partition(' ')[0]
+            if not pid:
                 print(f"{Colors.ERROR}用法: kill <PID>{Colors.RESET}")
                 return
+            # isdigit() 也接受 '²'、'١٢٣' 等非ASCII数字，需同时要求纯ASCII
+            if not (pid.isascii() and pid.isdigit()):
+                # 无效的PID不启动子进程
+                print(f"{Colors.ERROR}无效的进程ID: {pid}{Colors.RESET}")
+                return
             
-            pid = parts[1]
-            
-            if os.name == 'nt':
-                subprocess.run(['taskkill', '/PID', pid, '/F'], capture_output=True, text=True, encoding='gbk', shell=True)
-            else:
-                subprocess.run(['kill', '-9', pid], capture_output=True, text=True, encoding='utf-8')
+            self._run_tool((*SYSTEM_TOOL_COMMANDS['kill'], pid))
             
             print(f"{Colors.SUCCESS}已尝试结束进程: {pid}{Colors.RESET}")
         except Exception as e:
@@ -1746,49 +2450,93 @@ class ConsoleInterface:
     def _show_current_user(self):
         """显示当前用户"""
         try:
-            if os.name == 'nt':
-                result = subprocess.run(['whoami'], capture_output=True, text=True, encoding='gbk', shell=True)
-            else:
-                result = subprocess.run(['whoami'], capture_output=True, text=True, encoding='utf-8')
+            # 直接读取环境变量/用户数据库，不启动 whoami 子进程
+            try:
+                user = getpass.getuser()
+            except (KeyError, OSError):
+                # 没有用户名环境变量，密码数据库里也查不到时退回系统命令
+                result = self._run_tool(('whoami',))
+                if result.stdout:
+                    print(result.stdout.strip())
+                return
             
-            if result.stdout:
-                print(result.stdout.strip())
+            # 与 Windows 的 whoami 一致，显示为 域\用户名
+            domain = os.environ.get('USERDOMAIN') if IS_WINDOWS else None
+            print(f"{domain}\\{user}" if domain else user)
         except Exception as e:
             print(f"{Colors.ERROR}获取用户信息失败: {e}{Colors.RESET}")
     
     def _show_hostname(self):
         """显示主机名"""
         try:
-            if os.name == 'nt':
-                result = subprocess.run(['hostname'], capture_output=True, text=True, encoding='gbk', shell=True)
-            else:
-                result = subprocess.run(['hostname'], capture_output=True, text=True, encoding='utf-8')
-            
-            if result.stdout:
-                print(result.stdout.strip())
+            print(socket.gethostname())
         except Exception as e:
             print(f"{Colors.ERROR}获取主机名失败: {e}{Colors.RESET}")
     
     def _show_date(self):
         """显示日期"""
         try:
-            now = datetime.now()
-            print(now.strftime("%Y年%m月%d日 %A"))
+            print(time.strftime("%Y年%m月%d日 %A"))
         except Exception as e:
             print(f"{Colors.ERROR}获取日期失败: {e}{Colors.RESET}")
     
     def _show_time(self):
         """显示时间"""
         try:
-            now = datetime.now()
-            print(now.strftime("%H:%M:%S"))
+            print(time.strftime("%H:%M:%S"))
         except Exception as e:
             print(f"{Colors.ERROR}获取时间失败: {e}{Colors.RESET}")
     
-    def _ping_host(self, command: str):
+    @staticmethod
+    def _tcp_ping(host: str, port: int = 80, timeout: float = 1.0, count: int = 4,
+                  stop_on_first_timeout: bool = False) -> Tuple[str, List[Optional[float]]]:
+        """用TCP连接测量主机的连接时间（毫秒），超时的次数记为None
+
+        无需启动子进程，也不需要原始套接字权限；对方拒绝连接同样说明主机可达。
+        stop_on_first_timeout 为真时第一次探测超时就返回，不再等待其余探测
+        """
+        family, _, _, _, sockaddr = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+        rtts: List[Optional[float]] = []
+        for i in range(count):
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            start = time.perf_counter()
+            try:
+                sock.connect(sockaddr)
+                rtts.append((time.perf_counter() - start) * 1000)
+            except ConnectionRefusedError:
+                rtts.append((time.perf_counter() - start) * 1000)
+            except OSError:
+                rtts.append(None)
+                if i == 0 and stop_on_first_timeout:
+                    break
+            finally:
+                sock.close()
+        return f"{sockaddr[0]}:{port}", rtts
+    
+    def _ping_with_tool(self, host: str):
+        """调用系统ping命令（ICMP）并显示输出"""
+        result = self._run_tool((*SYSTEM_TOOL_COMMANDS['ping'], host))
+        
+        # 显示原始输出（去除过长部分）
+        max_lines = 15
+        lines = [f"  {line}" for line in result.stdout.splitlines() if line.strip()]
+        if len(lines) > max_lines:
+            lines = lines[:max_lines]
+            lines.append("  ... (输出已截断)")
+        if result.stderr.strip():
+            lines.append(f"{Colors.ERROR}{result.stderr.strip()}{Colors.RESET}")
+        
+        if result.returncode == 0:
+            lines.append(f"{Colors.SUCCESS}Ping 测试成功{Colors.RESET}")
+        else:
+            lines.append(f"{Colors.WARNING}警告: 请求超时，主机可能不可达{Colors.RESET}")
+        print('\n'.join(lines))
+    
+    def _ping_host(self, arg: str):
         """Ping测试"""
         try:
-            host = command[5:].strip()
+            host = arg
             if not host:
                 # 没有参数时显示友好提示
                 print(f"{Colors.INFO}用法: ping <主机名或IP地址>{Colors.RESET}")
@@ -1800,52 +2548,35 @@ class ConsoleInterface:
             
             print(f"{Colors.INFO}Ping测试: {host}{Colors.RESET}")
             
-            if os.name == 'nt':
-                # Windows ping 命令
-                result = subprocess.run(['ping', host], 
-                                      capture_output=True, 
-                                      text=True,
-                                      encoding='gbk',
-                                      shell=True)
+            has_tool = _which_cached(SYSTEM_TOOL_COMMANDS['ping'][0]) is not None
+            try:
+                address, rtts = self._tcp_ping(host, stop_on_first_timeout=has_tool)
+            except socket.gaierror:
+                print(f"{Colors.ERROR}错误: 无法解析主机名 '{host}'{Colors.RESET}")
+                return
+            
+            replies = [rtt for rtt in rtts if rtt is not None]
+            if not replies and has_tool:
+                # TCP端口第一次探测就没有响应时，交给系统ping用ICMP再试一次
+                self._ping_with_tool(host)
+                return
+            
+            lines = []
+            for rtt in rtts:
+                if rtt is None:
+                    lines.append(f"  {Colors.WARNING}TCP 连接 {address} 超时{Colors.RESET}")
+                else:
+                    lines.append(f"  TCP 连接 {address}: 时间={rtt:.1f}ms")
+            
+            lost = len(rtts) - len(replies)
+            if replies:
+                lines.append(f"{Colors.SUCCESS}统计: 尝试 {len(rtts)} 次，连接 {len(replies)} 次，超时 {lost} 次，"
+                             f"最短 {min(replies):.1f}ms，最长 {max(replies):.1f}ms，"
+                             f"平均 {sum(replies) / len(replies):.1f}ms{Colors.RESET}")
+                lines.append(f"{Colors.SUCCESS}TCP 连接测试成功{Colors.RESET}")
             else:
-                # Linux/macOS ping 命令
-                result = subprocess.run(['ping', '-c', '4', host], 
-                                      capture_output=True, 
-                                      text=True,
-                                      encoding='utf-8')
-            
-            if result.stdout:
-                # 解析并显示友好的结果
-                output = result.stdout
-                
-                # 提取关键信息
-                if "找不到主机" in output or "Unknown host" in output:
-                    print(f"{Colors.ERROR}错误: 无法解析主机名 '{host}'{Colors.RESET}")
-                elif "请求超时" in output or "Request timed out" in output:
-                    print(f"{Colors.WARNING}警告: 请求超时，主机可能不可达{Colors.RESET}")
-                elif "字节=32" in output or "bytes=32" in output:
-                    # 提取统计信息
-                    lines = output.split('\n')
-                    for line in lines:
-                        if "平均" in line or "Average" in line:
-                            print(f"{Colors.SUCCESS}统计: {line.strip()}{Colors.RESET}")
-                            break
-                    print(f"{Colors.SUCCESS}Ping 测试成功{Colors.RESET}")
-                
-                # 显示原始输出（去除过长部分）
-                max_lines = 15
-                lines = output.split('\n')[:max_lines]
-                if len(output.split('\n')) > max_lines:
-                    lines.append("... (输出已截断)")
-                
-                for line in lines:
-                    if line.strip():
-                        print(f"  {line}")
-            
-            if result.stderr:
-                error_msg = result.stderr.strip()
-                if error_msg:
-                    print(f"{Colors.ERROR}{error_msg}{Colors.RESET}")
+                lines.append(f"{Colors.WARNING}警告: 连接超时，主机可能不可达{Colors.RESET}")
+            print('\n'.join(lines))
                     
         except Exception as e:
             print(f"{Colors.ERROR}Ping测试失败: {e}{Colors.RESET}")
@@ -1853,67 +2584,59 @@ class ConsoleInterface:
     def _show_network_config(self):
         """显示网络配置"""
         try:
-            if os.name == 'nt':
-                result = subprocess.run(['ipconfig'], capture_output=True, text=True, encoding='gbk', shell=True)
-            else:
-                result = subprocess.run(['ifconfig'], capture_output=True, text=True, encoding='utf-8')
-            
-            if result.stdout:
-                print(result.stdout)
-            if result.stderr:
-                print(f"{Colors.ERROR}{result.stderr}{Colors.RESET}")
+            self._show_tool_output(SYSTEM_TOOL_COMMANDS['ifconfig'])
         except Exception as e:
             print(f"{Colors.ERROR}获取网络配置失败: {e}{Colors.RESET}")
     
     def _show_network_connections(self):
         """显示网络连接"""
         try:
-            if os.name == 'nt':
-                result = subprocess.run(['netstat', '-an'], capture_output=True, text=True, encoding='gbk', shell=True)
-            else:
-                result = subprocess.run(['netstat', '-tulpn'], capture_output=True, text=True, encoding='utf-8')
-            
-            if result.stdout:
-                print(result.stdout)
-            if result.stderr:
-                print(f"{Colors.ERROR}{result.stderr}{Colors.RESET}")
+            self._show_tool_output(SYSTEM_TOOL_COMMANDS['netstat'])
         except Exception as e:
             print(f"{Colors.ERROR}获取网络连接失败: {e}{Colors.RESET}")
     
-    def _base64_encode_decode(self, command: str):
+    def _base64_encode_decode(self, arg: str):
         """Base64编码/解码"""
         try:
-            text = command[7:].strip()
+            text = arg
             if not text:
                 print(f"{Colors.ERROR}用法: base64 <文本>{Colors.RESET}")
                 return
             
-            try:
-                decoded = base64.b64decode(text).decode('utf-8')
+            # 只有形如Base64的输入才尝试解码，普通文本直接编码
+            decoded = None
+            if len(text) % 4 == 0 and _B64_RE.match(text):
+                try:
+                    decoded = base64.b64decode(text, validate=True).decode('utf-8')
+                except (binascii.Error, UnicodeDecodeError):
+                    pass
+            
+            if decoded is not None:
                 print(f"{Colors.SUCCESS}解码结果:{Colors.RESET} {decoded}")
-            except:
-                encoded = base64.b64encode(text.encode('utf-8')).decode('utf-8')
+            else:
+                encoded = base64.b64encode(text.encode('utf-8')).decode('ascii')
                 print(f"{Colors.SUCCESS}编码结果:{Colors.RESET} {encoded}")
         except Exception as e:
             print(f"{Colors.ERROR}Base64操作失败: {e}{Colors.RESET}")
     
-    def _hex_encode_decode(self, command: str):
+    def _hex_encode_decode(self, arg: str):
         """十六进制编码/解码"""
         try:
-            text = command[4:].strip()
+            text = arg
             if not text:
                 print(f"{Colors.ERROR}用法: hex <文本>{Colors.RESET}")
                 return
             
-            hex_pattern = re.compile(r'^[0-9a-fA-F]+$')
-            if hex_pattern.match(text.replace(' ', '')):
+            stripped = text.replace(' ', '')
+            if _HEX_RE.match(stripped):
                 try:
-                    decoded = bytes.fromhex(text.replace(' ', '')).decode('utf-8')
+                    decoded = binascii.unhexlify(stripped).decode('utf-8')
                     print(f"{Colors.SUCCESS}解码结果:{Colors.RESET} {decoded}")
-                except:
+                except (binascii.Error, UnicodeDecodeError):
+                    # 奇数长度或解码出的不是UTF-8
                     print(f"{Colors.ERROR}无法解码为UTF-8文本{Colors.RESET}")
             else:
-                encoded = text.encode('utf-8').hex()
+                encoded = binascii.hexlify(text.encode('utf-8')).decode('ascii')
                 print(f"{Colors.SUCCESS}编码结果:{Colors.RESET} {encoded}")
         except Exception as e:
             print(f"{Colors.ERROR}十六进制操作失败: {e}{Colors.RESET}")
@@ -1938,10 +2661,11 @@ def main():
         
         results = param_system.execute_in_order(parsed_args, script_state)
         
-        print(f"{Colors.HEADER}执行结果:{Colors.RESET}")
-        for action, success in results:
-            status = f"{Colors.SUCCESS}成功" if success else f"{Colors.ERROR}失败"
-            print(f"  {status} {action}{Colors.RESET}")
+        # 结果状态前缀只构建一次，整个结果表一次写出
+        ok, failed, reset = f"{Colors.SUCCESS}成功", f"{Colors.ERROR}失败", Colors.RESET
+        lines = [f"{Colors.HEADER}执行结果:{reset}"]
+        lines.extend(f"  {ok if success else failed} {action}{reset}" for action, success in results)
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     else:
         console = ConsoleInterface()